@@ -3,13 +3,179 @@ Italian Fiscal Code Calculator - Modern Web Application
 A Flask-based web app with a modern, minimal design.
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
 from datetime import datetime
-from fiscalcode import FiscalCodeGenerator, parse_date
+from coalescer import RequestCoalescer
+from fiscalcode import FieldError, FiscalCode, FiscalCodeGenerator, LRUCache, parse_date
+from metrics import MetricsRegistry, SIZE_BUCKETS
+from municipalities import get_registry
+import hashlib
 import json
+import os
+import threading
+import time
 
 app = Flask(__name__)
 
+# Prometheus metrics served on /metrics
+metrics = MetricsRegistry()
+REQUESTS = metrics.counter(
+    'fiscalcode_http_requests_total', 'HTTP requests by endpoint, method and status.',
+    ('endpoint', 'method', 'status')
+)
+LATENCY = metrics.histogram(
+    'fiscalcode_http_request_duration_seconds',
+    'Time to produce the full response, streamed bodies included.', ('endpoint',)
+)
+VALIDATION_ERRORS = metrics.counter(
+    'fiscalcode_validation_errors_total', 'Rejected inputs by reason.', ('reason',)
+)
+BATCH_SIZES = metrics.histogram(
+    'fiscalcode_batch_size_records', 'Records per batch request.', buckets=SIZE_BUCKETS
+)
+RESPONSE_CACHE_LOOKUPS = metrics.counter(
+    'fiscalcode_response_cache_lookups_total', '/api/generate response cache lookups.', ('result',)
+)
+COALESCED_BATCH_SIZES = metrics.histogram(
+    'fiscalcode_coalesced_batch_size_records', 'Single generate requests served per coalesced batch.',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+
+# Rejected generator field (FieldError.field, BatchResult.field) -> bounded
+# reason label
+FIELD_REASONS = {
+    'surname': 'missing_name',
+    'name': 'missing_name',
+    'birth_date': 'invalid_birth_date',
+    'gender': 'invalid_gender',
+    'municipality_code': 'invalid_municipality',
+}
+
+# Largest number of records accepted by /api/generate/batch
+app.config['MAX_BATCH_SIZE'] = int(os.environ.get('FISCALCODE_MAX_BATCH_SIZE', 10000))
+
+# Seconds clients may cache municipality autocomplete results
+app.config['MUNICIPALITIES_MAX_AGE'] = 86400
+
+# Seconds clients may cache /api/demo and static files
+app.config['DEMO_MAX_AGE'] = 86400
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = int(os.environ.get('FISCALCODE_STATIC_MAX_AGE', 3600))
+
+# Successful /api/generate responses kept by normalized input; 0 disables
+app.config['RESPONSE_CACHE_SIZE'] = int(os.environ.get('FISCALCODE_RESPONSE_CACHE_SIZE', 10000))
+_response_cache = None
+
+DEMO_DATA = {
+    'surname': 'Rossi',
+    'name': 'Mario',
+    'birthDate': '01/01/1980',
+    'gender': 'M',
+    'municipality': 'H501'
+}
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl', 'application/json-lines')
+
+# Concurrent /api/generate calls are grouped into generate_many batches of
+# up to COALESCE_MAX_BATCH records, each waiting at most COALESCE_MAX_WAIT_MS
+# for company; 0 disables coalescing
+app.config['COALESCE_MAX_BATCH'] = int(os.environ.get('FISCALCODE_COALESCE_MAX_BATCH', 0))
+app.config['COALESCE_MAX_WAIT_MS'] = float(os.environ.get('FISCALCODE_COALESCE_MAX_WAIT_MS', 2))
+_coalescer = None
+
+# Guards the lazy creation of the shared coalescer and response cache
+_init_lock = threading.Lock()
+
+# Stage timings of the generation pipeline, served on /api/profile
+if os.environ.get('FISCALCODE_PROFILE', '').lower() in ('1', 'true', 'yes'):
+    FiscalCodeGenerator.enable_profiling()
+
+# Reject municipality codes the registry does not list
+if os.environ.get('FISCALCODE_STRICT_MUNICIPALITIES', '').lower() in ('1', 'true', 'yes'):
+    FiscalCodeGenerator.enable_strict_municipalities()
+
+
+def validation_error(message, reason, status=400):
+    """Count a rejected input under reason and build its JSON error response."""
+    VALIDATION_ERRORS.inc(reason)
+    return jsonify({'error': message}), status
+
+
+def generate_records(records):
+    """Coalescer batch handler: one BatchResult per (surname, name, date, gender, municipality)."""
+    COALESCED_BATCH_SIZES.observe(len(records))
+    return list(FiscalCodeGenerator.generate_many(records))
+
+
+def get_coalescer():
+    """The shared RequestCoalescer, or None when coalescing is disabled."""
+    global _coalescer
+    max_batch = app.config['COALESCE_MAX_BATCH']
+    if max_batch < 1:
+        return None
+    if _coalescer is None:
+        with _init_lock:
+            if _coalescer is None:
+                _coalescer = RequestCoalescer(
+                    generate_records, max_batch, app.config['COALESCE_MAX_WAIT_MS'] / 1000
+                )
+    return _coalescer
+
+
+def get_response_cache():
+    """The shared response cache, or None when it is disabled."""
+    global _response_cache
+    size = app.config['RESPONSE_CACHE_SIZE']
+    if size < 1:
+        return None
+    cache = _response_cache
+    if cache is None or cache.capacity != size:
+        with _init_lock:
+            cache = _response_cache
+            if cache is None or cache.capacity != size:
+                cache = _response_cache = LRUCache(size)
+    return cache
+
+
+def json_with_etag(body, etag):
+    """
+    JSON response carrying a strong ETag.
+    
+    /api/generate is POST-only (personal data stays out of URLs and
+    logs), and RFC 9110 allows 304 for GET and HEAD only, so the body is
+    always sent; repeats are served by the server-side response cache.
+    """
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+
+@app.before_request
+def start_timer():
+    """Remember when the request started, for the latency histogram."""
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    """
+    Count the request and observe its latency.
+    
+    Streamed bodies are generated after this hook runs, so views that
+    stream set g.latency_observed and observe LATENCY themselves once the
+    last chunk is sent. Other streamed responses (send_file) are timed here.
+    """
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    REQUESTS.inc(endpoint, request.method, str(response.status_code))
+    if not g.get('latency_observed'):
+        LATENCY.observe(time.perf_counter() - g.request_start, endpoint)
+    return response
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Expose metrics in the Prometheus text format."""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 
 @app.route('/')
 def index():
@@ -21,69 +187,215 @@ def index():
 def generate():
     """API endpoint to generate fiscal code."""
     try:
-        data = request.json
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return validation_error('Body must be a JSON object', 'invalid_json')
         
         # Extract data
-        surname = data.get('surname', '').strip()
-        name = data.get('name', '').strip()
-        date_str = data.get('birthDate', '').strip()
-        gender = data.get('gender', 'M').upper()
-        municipality = data.get('municipality', '').strip()
+        surname = str(data.get('surname') or '').strip()
+        name = str(data.get('name') or '').strip()
+        date_str = str(data.get('birthDate') or '').strip()
+        gender = str(data.get('gender') or 'M').upper()
+        municipality = str(data.get('municipality') or '').strip()
         
         # Validate
         if not surname or not name:
-            return jsonify({'error': 'Surname and name are required'}), 400
+            return validation_error('Surname and name are required', 'missing_name')
         
         if not date_str:
-            return jsonify({'error': 'Date of birth is required'}), 400
+            return validation_error('Date of birth is required', 'invalid_birth_date')
         
         if not municipality:
-            return jsonify({'error': 'Municipality code is required'}), 400
+            return validation_error('Municipality is required', 'invalid_municipality')
         
-        if len(municipality) != 4:
-            return jsonify({'error': 'Municipality code must be 4 characters'}), 400
-        
-        # Parse date
         try:
             birth_date = parse_date(date_str)
-        except ValueError as e:
-            return jsonify({'error': str(e)}), 400
+        except FieldError as e:
+            return validation_error(str(e), FIELD_REASONS[e.field])
+        
+        # The response does not echo the input, and the pipeline ignores
+        # case and date spelling, so equivalent inputs share an entry
+        key = (surname.upper(), name.upper(), birth_date, gender, municipality.upper())
+        cache = get_response_cache()
+        if cache is not None:
+            cached = cache.get(key)
+            RESPONSE_CACHE_LOOKUPS.inc('miss' if cached is None else 'hit')
+            if cached is not None:
+                return json_with_etag(*cached)
+        
+        # Resolve municipality name and generate code
+        coalescer = get_coalescer()
+        if coalescer is not None:
+            result = coalescer.submit((surname, name, birth_date, gender, municipality))
+            if result.error is not None:
+                return validation_error(result.error, FIELD_REASONS.get(result.field, 'other'))
+            fiscal_code = FiscalCode(result.fiscal_code)
+        else:
+            try:
+                fiscal_code = FiscalCodeGenerator.generate(
+                    surname, name, birth_date, gender, municipality
+                )
+            except FieldError as e:
+                return validation_error(str(e), FIELD_REASONS[e.field])
         
-        # Generate code
-        fiscal_code = FiscalCodeGenerator.generate(
-            surname, name, birth_date, gender, municipality
-        )
+        try:
+            place = get_registry().get(fiscal_code.municipality_code)
+        except Exception:
+            # Plain codes need no registry; the name is only a convenience
+            place = None
+        breakdown = fiscal_code.breakdown
         
         # Prepare response
         response = {
             'fiscalCode': fiscal_code,
             'breakdown': {
-                'surname': fiscal_code[0:3],
-                'name': fiscal_code[3:6],
-                'year': fiscal_code[6:8],
-                'month': fiscal_code[8],
-                'day': fiscal_code[9:11],
-                'municipality': fiscal_code[11:15],
-                'checkDigit': fiscal_code[15]
-            }
+                'surname': breakdown.surname,
+                'name': breakdown.name,
+                'year': breakdown.year,
+                'month': breakdown.month,
+                'day': breakdown.day,
+                'municipality': breakdown.municipality,
+                'checkDigit': breakdown.check_digit
+            },
+            'municipalityName': place.name if place else None
         }
         
-        return jsonify(response)
+        body = jsonify(response).get_data()
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        if cache is not None:
+            cache.put(key, (body, etag))
+        return json_with_etag(body, etag)
     
     except Exception as e:
+        app.logger.exception("Fiscal code generation failed")
         return jsonify({'error': str(e)}), 500
 
 
+def batch_record(item):
+    """Convert one JSON batch item into a generate_many record."""
+    if not isinstance(item, dict):
+        return ValueError("Each record must be a JSON object")
+    return (
+        str(item.get('surname') or '').strip(),
+        str(item.get('name') or '').strip(),
+        str(item.get('birthDate') or '').strip(),
+        str(item.get('gender') or 'M').upper(),
+        str(item.get('municipality') or '').strip()
+    )
+
+
+def read_ndjson(stream):
+    """Yield batch records from an NDJSON request body, one line at a time."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield batch_record(json.loads(line))
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+
+
+@app.route('/api/generate/batch', methods=['POST'])
+def generate_batch():
+    """
+    API endpoint to generate many fiscal codes in one request.
+    
+    Accepts a JSON array of records or an NDJSON body (one record per line)
+    and streams back one JSON line per record as it is computed, either
+    {"index": i, "fiscalCode": ...} or {"index": i, "error": ...}.
+    """
+    max_size = app.config['MAX_BATCH_SIZE']
+    start = g.request_start
+    endpoint = request.url_rule.rule
+    
+    if request.mimetype in NDJSON_MIMETYPES:
+        records = read_ndjson(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            return validation_error('Body must be a JSON array or NDJSON', 'invalid_json')
+        if len(data) > max_size:
+            return validation_error(f'Batch exceeds maximum size of {max_size} records', 'batch_too_large', 413)
+        records = (batch_record(item) for item in data)
+    
+    def stream():
+        dumps = json.dumps
+        count = 0
+        try:
+            for result in FiscalCodeGenerator.generate_many(records):
+                if result.index >= max_size:
+                    VALIDATION_ERRORS.inc('batch_too_large')
+                    yield dumps({'error': f'Batch exceeds maximum size of {max_size} records'}) + '\n'
+                    return
+                count += 1
+                if result.error is None:
+                    yield dumps({'index': result.index, 'fiscalCode': result.fiscal_code}) + '\n'
+                else:
+                    # Records arrive as strings, so an error without a field
+                    # is batch_record or read_ndjson rejecting the JSON itself
+                    VALIDATION_ERRORS.inc(FIELD_REASONS.get(result.field, 'invalid_json'))
+                    yield dumps({'index': result.index, 'error': result.error}) + '\n'
+        finally:
+            BATCH_SIZES.observe(count)
+            LATENCY.observe(time.perf_counter() - start, endpoint)
+    
+    g.latency_observed = True
+    return Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+
+
+@app.route('/api/municipalities', methods=['GET'])
+def municipalities():
+    """
+    Autocomplete municipality names.
+    
+    Query parameters: q (name prefix), limit (default 10, at most 50).
+    The registry never changes while the app runs, so responses are
+    cacheable by browsers and proxies.
+    """
+    prefix = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    
+    matches = get_registry().search(prefix, limit)
+    response = jsonify([
+        {'code': m.code, 'name': m.name, 'province': m.province}
+        for m in matches
+    ])
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['MUNICIPALITIES_MAX_AGE']
+    return response
+
+
+@app.route('/api/profile', methods=['GET', 'DELETE'])
+def profile():
+    """
+    Stage timings recorded since startup (or the last reset).
+    
+    GET returns JSON, or the text table with ?format=text; DELETE resets
+    the counters. Answers 404 unless FISCALCODE_PROFILE is set.
+    """
+    profiler = FiscalCodeGenerator._profiler
+    if profiler is None:
+        return jsonify({'error': 'Profiling is disabled; set FISCALCODE_PROFILE=1'}), 404
+    if request.method == 'DELETE':
+        profiler.reset()
+        return '', 204
+    if request.args.get('format') == 'text':
+        return Response(profiler.summary() + '\n', mimetype='text/plain')
+    return jsonify({
+        stage: {'calls': stats.calls, 'seconds': stats.seconds, 'meanMicroseconds': stats.mean_us}
+        for stage, stats in profiler.stats().items()
+    })
+
+
 @app.route('/api/demo', methods=['GET'])
 def demo_data():
     """Get demo data for preview."""
-    return jsonify({
-        'surname': 'Rossi',
-        'name': 'Mario',
-        'birthDate': '01/01/1980',
-        'gender': 'M',
-        'municipality': 'H501'
-    })
+    response = jsonify(DEMO_DATA)
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['DEMO_MAX_AGE']
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 if __name__ == '__main__':
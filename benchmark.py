@@ -0,0 +1,256 @@
+"""
+Italian Fiscal Code - Benchmark Suite
+Times the hot paths of the library and the web API on synthetic data.
+
+Each benchmark calls one function once per synthetic record (batch
+benchmarks once per BATCH_SIZE records) and reports
+ops/sec, p50/p99 latency and peak memory (traced in a separate pass, since
+tracing slows the code down). Results can be saved as JSON and compared
+against a saved baseline, failing when a benchmark regresses.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --size 50000 --output results.json
+    python benchmark.py --baseline baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from fiscalcode import FiscalCodeGenerator, parse_date
+
+
+class BenchmarkResult(NamedTuple):
+    """Measurements of one benchmark."""
+    name: str
+    ops: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    peak_memory_kb: float
+
+
+_SYLLABLES = ('ro', 'ssi', 'bi', 'an', 'chi', 'fer', 'ra', 'ri', 'es', 'po', 'si', 'to',
+              'ma', 'ri', 'no', 'gre', 'co', 'lo', 'mbo', 'ric', 'ci', 'de', 'lu', 'ca')
+_MUNICIPALITIES = ('H501', 'F205', 'F839', 'L219', 'G273', 'D969', 'A944', 'D612', 'Z110')
+
+# Records per call of the batch benchmarks (generate_many)
+BATCH_SIZE = 1000
+
+
+def make_dataset(size: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Build size synthetic people, reproducible for a given seed."""
+    rng = random.Random(seed)
+
+    def word() -> str:
+        return ''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+    people = []
+    for _ in range(size):
+        birth_date = datetime(rng.randint(1930, 2020), rng.randint(1, 12), rng.randint(1, 28))
+        people.append({
+            'surname': word(),
+            'name': word(),
+            'birth_date': birth_date,
+            'birth_date_str': birth_date.strftime('%d/%m/%Y'),
+            'gender': rng.choice('MF'),
+            'municipality': rng.choice(_MUNICIPALITIES),
+        })
+    return people
+
+
+def measure(name: str, func: Callable, calls: Sequence[Tuple], repeat: int = 3) -> BenchmarkResult:
+    """
+    Run func(*args) for every args in calls.
+
+    Throughput is the best of repeat timed passes; latency percentiles come
+    from per-call timings of the last pass; peak memory from one more pass
+    under tracemalloc.
+    """
+    clock = time.perf_counter_ns
+    best_total = None
+    latencies = []
+    for _ in range(repeat):
+        latencies = []
+        record = latencies.append
+        for args in calls:
+            start = clock()
+            func(*args)
+            record(clock() - start)
+        total = sum(latencies)
+        if best_total is None or total < best_total:
+            best_total = total
+
+    tracemalloc.start()
+    for args in calls:
+        func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    n = len(latencies)
+    return BenchmarkResult(
+        name=name,
+        ops=n,
+        ops_per_sec=n / (best_total / 1e9) if best_total else 0.0,
+        p50_us=latencies[n // 2] / 1000 if n else 0.0,
+        p99_us=latencies[min(n - 1, n * 99 // 100)] / 1000 if n else 0.0,
+        peak_memory_kb=peak / 1024,
+    )
+
+
+def benchmarks(people: List[Dict[str, Any]]) -> Dict[str, Tuple[Callable, List[Tuple]]]:
+    """Benchmark name -> (function, argument tuples)."""
+    generator = FiscalCodeGenerator
+    codes = [
+        generator.generate(p['surname'], p['name'], p['birth_date'], p['gender'], p['municipality'])
+        for p in people
+    ]
+    # Batch input as read from CSV: dates as DD/MM/YYYY strings
+    records = [
+        (p['surname'], p['name'], p['birth_date_str'], p['gender'], p['municipality'])
+        for p in people
+    ]
+    suite = {
+        'generate': (
+            generator.generate,
+            [(p['surname'], p['name'], p['birth_date'], p['gender'], p['municipality']) for p in people]
+        ),
+        'generate_many': (
+            lambda records: deque(generator.generate_many(records), maxlen=0),
+            [(records[i:i + BATCH_SIZE],) for i in range(0, len(records), BATCH_SIZE)]
+        ),
+        'calculate_check_digit': (generator.calculate_check_digit, [(code[:15],) for code in codes]),
+        'calculate_check_digit_bytes': (
+            generator.calculate_check_digit, [(code[:15].encode('ascii'),) for code in codes]
+        ),
+        'extract_consonants': (generator.extract_consonants, [(p['surname'],) for p in people]),
+        'parse_date': (parse_date, [(p['birth_date_str'],) for p in people]),
+        'validate': (generator.validate, [(code,) for code in codes]),
+        'decode': (generator.decode, [(code,) for code in codes]),
+    }
+
+    try:
+        from app import app
+    except ImportError:
+        print("Skipping api_generate: Flask is not installed", file=sys.stderr)
+        return suite
+
+    # api_generate times the full pipeline; api_generate_cached repeats the
+    # same payloads with the response cache on, so after the first round it
+    # times cache hits
+    app.config['RESPONSE_CACHE_SIZE'] = 0
+    client = app.test_client()
+
+    def post_generate(payload, cache_size=0):
+        app.config['RESPONSE_CACHE_SIZE'] = cache_size
+        response = client.post('/api/generate', json=payload)
+        if response.status_code != 200:
+            raise RuntimeError(f"/api/generate returned {response.status_code}")
+
+    payloads = [{
+        'surname': p['surname'],
+        'name': p['name'],
+        'birthDate': p['birth_date_str'],
+        'gender': p['gender'],
+        'municipality': p['municipality'],
+    } for p in people]
+    suite['api_generate'] = (post_generate, [(payload,) for payload in payloads])
+    suite['api_generate_cached'] = (
+        post_generate, [(payload, len(payloads)) for payload in payloads]
+    )
+    return suite
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare ops/sec against a baseline.
+
+    Returns:
+        Names of benchmarks slower than the baseline by more than threshold
+    """
+    base_results = baseline.get('results', {})
+    regressions = []
+    print("\nComparison with baseline:")
+    for result in results:
+        base = base_results.get(result.name)
+        if not base or not base.get('ops_per_sec'):
+            print(f"  {result.name:<28} (no baseline)")
+            continue
+        change = result.ops_per_sec / base['ops_per_sec'] - 1
+        flag = ''
+        if change < -threshold:
+            flag = '  REGRESSION'
+            regressions.append(result.name)
+        print(f"  {result.name:<28} {change:+8.1%}{flag}")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the fiscal code library and API.")
+    parser.add_argument('--size', type=int, default=10000, help="Synthetic records per benchmark (default: 10000)")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for the dataset (default: 42)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed passes per benchmark, best kept (default: 3)")
+    parser.add_argument('--only', help="Comma-separated benchmark names to run")
+    parser.add_argument('-o', '--output', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Allowed ops/sec drop versus the baseline (default: 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite; return 1 if a benchmark regressed against the baseline."""
+    args = parse_args(argv)
+    people = make_dataset(args.size, args.seed)
+    suite = benchmarks(people)
+    if args.only:
+        wanted = args.only.split(',')
+        unknown = set(wanted) - set(suite)
+        if unknown:
+            print(f"Unknown benchmarks: {', '.join(sorted(unknown))}", file=sys.stderr)
+            return 2
+        suite = {name: suite[name] for name in wanted}
+
+    print(f"{'benchmark':<28} {'ops/s':>12} {'p50 us':>9} {'p99 us':>9} {'peak KiB':>10}")
+    results = []
+    for name, (func, calls) in suite.items():
+        result = measure(name, func, calls, args.repeat)
+        results.append(result)
+        print(f"{name:<28} {result.ops_per_sec:12,.0f} {result.p50_us:9.2f} "
+              f"{result.p99_us:9.2f} {result.peak_memory_kb:10.1f}")
+
+    if args.output:
+        report = {
+            'metadata': {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'size': args.size,
+                'seed': args.seed,
+                'repeat': args.repeat,
+            },
+            'results': {result.name: result._asdict() for result in results},
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
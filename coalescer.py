@@ -0,0 +1,109 @@
+"""
+Italian Fiscal Code - Request Coalescer
+Groups concurrent single requests into small batches.
+
+Callers block in submit() while a background thread collects items for up
+to max_wait seconds (or until max_batch_size items are queued), runs them
+through one batch handler call and hands each caller its own result. Under
+load this turns many independent pipeline runs into a few batch runs; the
+added latency is bounded by max_wait.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Sequence
+
+
+class RequestCoalescer:
+    """Micro-batching front for a batch handler."""
+
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 64,
+        max_wait: float = 0.002
+    ):
+        """
+        Args:
+            handler: Called with a list of items; must return one result
+                per item, in order
+            max_batch_size: Largest number of items per handler call
+            max_wait: Seconds the first item of a batch may wait for others
+        """
+        if max_batch_size < 1:
+            raise ValueError("Max batch size must be at least 1")
+        if max_wait < 0:
+            raise ValueError("Max wait must not be negative")
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Process item as part of the next batch and return its result.
+
+        Raises:
+            Whatever the handler raised for the batch containing item
+        """
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((item, future))
+        return future.result(timeout)
+
+    def close(self):
+        """Stop the worker after it finishes the queued items."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(None)
+            worker.join()
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name='fiscalcode-coalescer', daemon=True
+                )
+                self._worker.start()
+
+    def _collect(self, first: tuple) -> List[tuple]:
+        """Gather more items after first until the batch is full or max_wait expires."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                # Closing: finish this batch, then let _run see the sentinel
+                self._queue.put(None)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            futures = [future for _, future in batch]
+            try:
+                results = self.handler([item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError("Batch handler returned the wrong number of results")
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future, result in zip(futures, results):
+                future.set_result(result)
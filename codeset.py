@@ -0,0 +1,198 @@
+"""
+Italian Fiscal Code - Compact Code Set
+Memory-efficient set of fiscal codes for duplicate detection.
+
+Codes are packed into 64-bit integers (see fiscalcode.pack_code) and kept
+in a sorted array('Q'): 8 bytes per code instead of a str object plus a
+hash table slot. Omocodic codes, which do not pack, go in a small side set.
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, List
+
+from fiscalcode import FiscalCodeGenerator, _pack_plain, pack_code, unpack_code
+
+
+# Codes sorted at a time by update; sorting goes through a list of Python
+# ints (about 36 bytes each), so this bounds its temporary memory
+SORT_RUN_SIZE = 1 << 20
+
+
+class FiscalCodeSet:
+    """Sorted, array-backed set of fiscal codes."""
+
+    __slots__ = ('_packed', '_omocodes')
+
+    def __init__(self, codes: Iterable[str] = ()):
+        self._packed = array('Q')
+        self._omocodes = set()
+        self.update(codes)
+
+    @classmethod
+    def _from_parts(cls, packed: array, omocodes: set) -> 'FiscalCodeSet':
+        result = cls()
+        result._packed = packed
+        result._omocodes = omocodes
+        return result
+
+    def update(self, codes: Iterable[str]):
+        """
+        Bulk insert codes.
+
+        New codes are packed into buffers of SORT_RUN_SIZE values, each
+        sorted on its own, and the sorted runs are merged with the
+        existing array in one pass, so inserting n codes costs
+        O(n log n) instead of n array insertions and never sorts more
+        than SORT_RUN_SIZE Python ints at once.
+
+        Raises:
+            ValueError: If a code is not a valid fiscal code; the set is
+                then left unchanged
+        """
+        runs = []
+        buffer = array('Q')
+        omocodes = set()
+        validate = FiscalCodeGenerator.validate
+        is_omocode = FiscalCodeGenerator.is_omocode
+        for code in codes:
+            if not validate(code):
+                raise ValueError(f"Invalid fiscal code '{code}'")
+            if is_omocode(code):
+                omocodes.add(code)
+                continue
+            buffer.append(_pack_plain(code))
+            if len(buffer) >= SORT_RUN_SIZE:
+                runs.append(array('Q', sorted(buffer)))
+                buffer = array('Q')
+        if buffer:
+            runs.append(array('Q', sorted(buffer)))
+        self._omocodes.update(omocodes)
+        if runs:
+            self._packed = _merge_runs([self._packed] + runs)
+
+    def add(self, code: str):
+        """Insert a single code (O(n); prefer update for many codes)."""
+        if FiscalCodeGenerator.is_omocode(code):
+            self.update((code,))
+            return
+        value = pack_code(code)
+        packed = self._packed
+        i = bisect_left(packed, value)
+        if i == len(packed) or packed[i] != value:
+            packed.insert(i, value)
+
+    def __contains__(self, code: object) -> bool:
+        if not isinstance(code, str):
+            return False
+        if FiscalCodeGenerator.is_omocode(code):
+            return code in self._omocodes
+        try:
+            value = pack_code(code)
+        except ValueError:
+            return False
+        packed = self._packed
+        i = bisect_left(packed, value)
+        return i < len(packed) and packed[i] == value
+
+    def __len__(self) -> int:
+        return len(self._packed) + len(self._omocodes)
+
+    def __iter__(self) -> Iterator[str]:
+        for value in self._packed:
+            yield unpack_code(value)
+        yield from sorted(self._omocodes)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FiscalCodeSet):
+            return NotImplemented
+        return self._packed == other._packed and self._omocodes == other._omocodes
+
+    def __repr__(self) -> str:
+        return f"<FiscalCodeSet of {len(self)} codes>"
+
+    def union(self, other: 'FiscalCodeSet') -> 'FiscalCodeSet':
+        """Codes in either set."""
+        return self._from_parts(
+            _merge(self._packed, other._packed, keep='either'),
+            self._omocodes | other._omocodes
+        )
+
+    def intersection(self, other: 'FiscalCodeSet') -> 'FiscalCodeSet':
+        """Codes in both sets."""
+        return self._from_parts(
+            _merge(self._packed, other._packed, keep='both'),
+            self._omocodes & other._omocodes
+        )
+
+    def difference(self, other: 'FiscalCodeSet') -> 'FiscalCodeSet':
+        """Codes in this set but not in other."""
+        return self._from_parts(
+            _merge(self._packed, other._packed, keep='left'),
+            self._omocodes - other._omocodes
+        )
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def memory_usage(self) -> int:
+        """Approximate bytes used by the stored codes."""
+        side = sum(code.__sizeof__() for code in self._omocodes) + self._omocodes.__sizeof__()
+        return self._packed.buffer_info()[1] * self._packed.itemsize + side
+
+
+def _merge_runs(runs: List[array]) -> array:
+    """Merge any number of sorted arrays into one, without duplicates."""
+    result = array('Q')
+    append = result.append
+    last = None
+    for value in heapq.merge(*runs):
+        if value != last:
+            append(value)
+            last = value
+    return result
+
+
+def _merge(left: array, right: array, keep: str) -> array:
+    """
+    Merge two sorted arrays without duplicates in one linear pass.
+
+    keep selects the values to output: 'either' (union), 'both'
+    (intersection) or 'left' (difference).
+    """
+    result = array('Q')
+    append = result.append
+    i = j = 0
+    n, m = len(left), len(right)
+    last = None
+    while i < n and j < m:
+        a, b = left[i], right[j]
+        if a < b:
+            if keep != 'both' and a != last:
+                append(a)
+                last = a
+            i += 1
+        elif b < a:
+            if keep == 'either' and b != last:
+                append(b)
+                last = b
+            j += 1
+        else:
+            if keep != 'left' and a != last:
+                append(a)
+                last = a
+            i += 1
+            j += 1
+    if keep != 'both':
+        for a in left[i:]:
+            if a != last:
+                append(a)
+                last = a
+    if keep == 'either':
+        for b in right[j:]:
+            if b != last:
+                append(b)
+                last = b
+    return result
@@ -0,0 +1,188 @@
+"""
+Italian Fiscal Code - Columnar helpers
+Generate and validate whole columns of pandas DataFrames and Arrow tables.
+
+Columns are processed in chunks: each chunk is converted to Python lists
+once and zipped into tuples for FiscalCodeGenerator.generate_many, so no
+per-row dicts or Series are built. pandas, pyarrow and numpy are optional
+and imported only by the helpers that need them; fiscalcode.py never
+imports this module.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fiscalcode import DEFAULT_CHUNK_SIZE, RECORD_FIELDS, FiscalCodeGenerator
+
+
+def _column_names(columns: Optional[Dict[str, str]]) -> List[str]:
+    """Source column for each RECORD_FIELDS entry; unmapped fields keep their name."""
+    columns = columns or {}
+    unknown = set(columns) - set(RECORD_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [columns.get(field, field) for field in RECORD_FIELDS]
+
+
+def generate_columns(
+    surnames: Sequence[Any],
+    names: Sequence[Any],
+    birth_dates: Sequence[Any],
+    genders: Sequence[Any],
+    municipality_codes: Sequence[Any]
+) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+    """
+    Generate fiscal codes from parallel columns.
+
+    Values are interpreted as by generate_many: birth dates may be date
+    or datetime objects or strings, municipalities codes or names.
+
+    Returns:
+        Tuple of (codes, errors), one entry per row; exactly one of the two
+        is None for each row
+    """
+    columns = (surnames, names, birth_dates, genders, municipality_codes)
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("Columns must have the same length")
+
+    codes: List[Optional[str]] = []
+    errors: List[Optional[str]] = []
+    add_code = codes.append
+    add_error = errors.append
+    for result in FiscalCodeGenerator.generate_many(zip(*columns)):
+        add_code(result.fiscal_code)
+        add_error(result.error)
+    return codes, errors
+
+
+def validate_column(codes: Sequence[Any]) -> Any:
+    """
+    Validate a column of codes; missing values are invalid.
+
+    Uses the NumPy kernels in vectorized.py.
+
+    Returns:
+        Boolean numpy array
+    """
+    import numpy as np
+    from vectorized import validate_array
+
+    values = [code if isinstance(code, str) else '' for code in codes]
+    valid, _ = validate_array(np.array(values, dtype=str))
+    return valid
+
+
+def _series_values(series: Any) -> List[Any]:
+    """Python values of a pandas Series, missing values (NaN, NaT, NA) as None."""
+    import pandas as pd
+
+    values = series
+    if pd.api.types.is_datetime64_any_dtype(series):
+        # Plain date objects are much cheaper to read than Timestamps
+        values = series.dt.date
+    return values.astype(object).where(series.notna(), None).tolist()
+
+
+def generate_frame(
+    frame: Any,
+    columns: Optional[Dict[str, str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Any:
+    """
+    Generate fiscal codes for every row of a pandas DataFrame.
+
+    Args:
+        frame: DataFrame with one column per RECORD_FIELDS entry
+        columns: Field name -> column name, for columns named differently
+        chunk_size: Rows converted to Python values at a time
+
+    Returns:
+        DataFrame with fiscal_code and error columns, on frame's index
+    """
+    import pandas as pd
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    sources = [frame[name] for name in _column_names(columns)]
+    codes: List[Optional[str]] = []
+    errors: List[Optional[str]] = []
+    for start in range(0, len(frame), chunk_size):
+        chunk = [_series_values(column.iloc[start:start + chunk_size]) for column in sources]
+        chunk_codes, chunk_errors = generate_columns(*chunk)
+        codes.extend(chunk_codes)
+        errors.extend(chunk_errors)
+    return pd.DataFrame({'fiscal_code': codes, 'error': errors}, index=frame.index, dtype=object)
+
+
+def validate_series(series: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Any:
+    """
+    Validate a pandas Series of codes.
+
+    Returns:
+        Boolean Series named 'valid', on series's index
+    """
+    import numpy as np
+    import pandas as pd
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    parts = [
+        validate_column(_series_values(series.iloc[start:start + chunk_size]))
+        for start in range(0, len(series), chunk_size)
+    ]
+    valid = np.concatenate(parts) if parts else np.zeros(0, dtype=bool)
+    return pd.Series(valid, index=series.index, name='valid')
+
+
+def generate_table(
+    table: Any,
+    columns: Optional[Dict[str, str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Any:
+    """
+    Generate fiscal codes for every row of a pyarrow Table.
+
+    Arrow date and timestamp columns arrive as date/datetime objects and
+    string columns are parsed as by generate_many.
+
+    Args:
+        table: Table with one column per RECORD_FIELDS entry
+        columns: Field name -> column name, for columns named differently
+        chunk_size: Rows converted to Python values at a time
+
+    Returns:
+        Table with string columns fiscal_code and error
+    """
+    import pyarrow as pa
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    table = table.select(_column_names(columns))
+    codes: List[Optional[str]] = []
+    errors: List[Optional[str]] = []
+    for batch in table.to_batches(max_chunksize=chunk_size):
+        chunk = [column.to_pylist() for column in batch.columns]
+        chunk_codes, chunk_errors = generate_columns(*chunk)
+        codes.extend(chunk_codes)
+        errors.extend(chunk_errors)
+    return pa.table({
+        'fiscal_code': pa.array(codes, type=pa.string()),
+        'error': pa.array(errors, type=pa.string()),
+    })
+
+
+def validate_arrow(codes: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Any:
+    """
+    Validate an Arrow Array or ChunkedArray of codes.
+
+    Returns:
+        ChunkedArray of booleans, one chunk per chunk_size slice
+    """
+    import pyarrow as pa
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    parts = [
+        pa.array(validate_column(codes.slice(start, chunk_size).to_pylist()))
+        for start in range(0, len(codes), chunk_size)
+    ]
+    return pa.chunked_array(parts, type=pa.bool_())
@@ -3,9 +3,296 @@ Italian Fiscal Code Generator (Codice Fiscale Italiano)
 A modern app to calculate Italian fiscal codes with validation.
 """
 
+import argparse
+import csv
+import json
+import os
 import re
-from datetime import datetime
-from typing import Tuple, Optional
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, deque
+from datetime import date, datetime
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple, Union
+
+from municipalities import get_registry, is_municipality_code
+
+
+# Field order expected for tuple records in batch generation
+RECORD_FIELDS = ('surname', 'name', 'birth_date', 'gender', 'municipality_code')
+
+# Rows per process-pool task in parallel batch generation
+DEFAULT_CHUNK_SIZE = 20000
+
+# Largest number of date strings and municipalities generate_many
+# remembers per call
+_BATCH_MEMO_SIZE = 65536
+
+# Letters that do not decompose into an ASCII letter plus accents
+_LETTER_LIGATURES = {
+    'ß': 'SS', 'Æ': 'AE', 'æ': 'AE', 'Œ': 'OE', 'œ': 'OE',
+    'Ø': 'O', 'ø': 'O', 'Đ': 'D', 'đ': 'D', 'Ł': 'L', 'ł': 'L'
+}
+
+
+def _fold_letter(char: str) -> Optional[str]:
+    """Upper-case ASCII letters for char without accents, None if not a letter."""
+    if char in _LETTER_LIGATURES:
+        return _LETTER_LIGATURES[char]
+    # Keep every letter of digraphs and ligatures (Ǉ -> LJ, ﬁ -> FI)
+    nfkd = unicodedata.normalize('NFKD', char).upper()
+    return ''.join(c for c in nfkd if 'A' <= c <= 'Z') or None
+
+
+class _LetterTable(dict):
+    """
+    str.translate table folding text to bare upper-case letters.
+    
+    Accented letters lose their accents (È -> E) and everything that is
+    not a letter (apostrophes, spaces, hyphens, digits) is deleted.
+    Latin characters (up to U+024F) are compiled at import; anything else
+    is folded on every use and not stored, so arbitrary input cannot grow
+    the table.
+    """
+    
+    def __missing__(self, code_point: int) -> Optional[str]:
+        return _fold_letter(chr(code_point))
+
+
+_LETTERS = _LetterTable((i, _fold_letter(chr(i))) for i in range(0x250))
+
+# Second-stage tables: keep only consonants, or only vowels
+_DROP_VOWELS = str.maketrans('', '', 'AEIOU')
+_DROP_CONSONANTS = str.maketrans('', '', 'BCDFGHJKLMNPQRSTVWXYZ')
+
+# bytes.translate tables for ASCII names in generate_many: fold to upper
+# case, keeping only consonants or only vowels; same result as _LETTERS
+# followed by the drop tables, without building intermediate strings
+_ASCII_UPPER = bytes.maketrans(b'abcdefghijklmnopqrstuvwxyz',
+                               b'ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+_NOT_CONSONANT = bytes(b for b in range(256) if chr(b).upper() not in 'BCDFGHJKLMNPQRSTVWXYZ' or b > 127)
+_NOT_VOWEL = bytes(b for b in range(256) if chr(b).upper() not in 'AEIOU' or b > 127)
+
+
+# Structure of a fiscal code; digit positions also accept the omocodia
+# substitution letters (see DIGIT_VALUES)
+_CODE_PATTERN = re.compile(
+    r'[A-Z]{6}[0-9LMNPQRSTUV]{2}[A-Z][0-9LMNPQRSTUV]{2}[A-Z][0-9LMNPQRSTUV]{3}[A-Z]'
+)
+
+# Codes whose digit positions hold only digits (no omocodia)
+_PLAIN_DIGITS_PATTERN = re.compile(r'.{6}[0-9]{2}.[0-9]{2}.[0-9]{3}')
+
+# Omocodia substitution letters back to the digits they replace
+_OMOCODE_TO_DIGIT = str.maketrans('LMNPQRSTUV', '0123456789')
+
+# Date formats accepted by parse_date
+_DMY_PATTERN = re.compile(r'([0-9]{1,2})/([0-9]{1,2})/([0-9]{4})')
+_ISO_DATE_PATTERN = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})')
+
+# Longest day of each month, February allowing leap years; 29 February
+# also needs a two-digit year divisible by 4 (00 included: 2000 was leap)
+_DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# "DD/MM/" prefix of every valid day of the year -> (month, day), for the
+# batch date fast path (see _split_date)
+_DAY_MONTHS = {
+    f"{day:02d}/{month:02d}/": (month, day)
+    for month in range(1, 13)
+    for day in range(1, _DAYS_IN_MONTH[month] + 1)
+}
+
+
+def _weight_table(weights: Dict[str, int]) -> bytes:
+    """Flatten a character -> weight map into a bytes.translate table."""
+    return bytes(weights.get(chr(i), 0) for i in range(256))
+
+
+class FieldError(ValueError):
+    """Invalid input value; field names the RECORD_FIELDS entry it belongs to."""
+    
+    def __init__(self, message: str, field: str):
+        super().__init__(message)
+        self.field = field
+
+
+def _load_registry():
+    """The shared municipality registry; a failure to load it is a FieldError."""
+    try:
+        return get_registry()
+    except Exception as e:
+        # A missing or malformed registry file (OSError, KeyError, ...)
+        raise FieldError(f"Municipality registry unavailable ({e})", 'municipality_code') from None
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one record in a batch run."""
+    index: int
+    fiscal_code: Optional[str]
+    error: Optional[str]
+    # RECORD_FIELDS entry the error is about, when known
+    field: Optional[str] = None
+
+
+class DecodedFiscalCode(NamedTuple):
+    """Personal data recovered from a fiscal code."""
+    birth_date: datetime
+    gender: str
+    municipality_code: str
+
+
+class CodeBreakdown(NamedTuple):
+    """The components of a fiscal code, as written in it."""
+    surname: str
+    name: str
+    year: str
+    month: str
+    day: str
+    municipality: str
+    check_digit: str
+
+
+# Human-readable labels of the CodeBreakdown fields
+BREAKDOWN_LABELS = (
+    'Surname Code', 'Name Code', 'Year of Birth', 'Month', 'Day (+ 40 if F)',
+    'Municipality', 'Check Digit'
+)
+
+
+class CacheStats(NamedTuple):
+    """Counters of an LRUCache."""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    capacity: int
+    
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """
+    Size-bounded least-recently-used cache with hit/miss/eviction counters.
+    
+    Safe to share between threads: a race can at worst skew the counters
+    or drop an entry, never return a wrong value.
+    """
+    
+    __slots__ = ('capacity', 'hits', 'misses', 'evictions', '_data')
+    
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("Cache capacity must be at least 1")
+        self.capacity = capacity
+        self.hits = self.misses = self.evictions = 0
+        self._data = OrderedDict()
+    
+    def get(self, key: Any) -> Any:
+        """Return the cached value, or None on a miss."""
+        try:
+            value = self._data[key]
+            self._data.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+    
+    def put(self, key: Any, value: Any):
+        """Store a value, evicting the least recently used one when full."""
+        data = self._data
+        data[key] = value
+        if len(data) > self.capacity:
+            try:
+                data.popitem(last=False)
+                self.evictions += 1
+            except KeyError:
+                pass
+    
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+    
+    def stats(self) -> CacheStats:
+        """Snapshot of the counters."""
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._data), self.capacity)
+
+
+# Default entries per component cache in FiscalCodeGenerator.enable_cache
+DEFAULT_CACHE_CAPACITY = 65536
+
+
+class StageStats(NamedTuple):
+    """Cumulative timing of one generation stage."""
+    calls: int
+    seconds: float
+    
+    @property
+    def mean_us(self) -> float:
+        """Average time per call in microseconds."""
+        return self.seconds / self.calls * 1e6 if self.calls else 0.0
+
+
+class StageProfiler:
+    """
+    Cumulative wall time and call counts per generation stage.
+    
+    Installed by FiscalCodeGenerator.enable_profiling(). Safe to share
+    between threads.
+    """
+    
+    __slots__ = ('_lock', '_calls', '_seconds')
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {}
+        self._seconds: Dict[str, float] = {}
+    
+    def call(self, stage: str, func: Any, *args: Any) -> Any:
+        """Run func(*args), charging its wall time to stage."""
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.record(stage, time.perf_counter() - start)
+    
+    def record(self, stage: str, seconds: float):
+        """Add one call of the given duration to stage."""
+        with self._lock:
+            self._calls[stage] = self._calls.get(stage, 0) + 1
+            self._seconds[stage] = self._seconds.get(stage, 0.0) + seconds
+    
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._calls.clear()
+            self._seconds.clear()
+    
+    def stats(self) -> Dict[str, StageStats]:
+        """Snapshot of the counters, slowest stage first."""
+        with self._lock:
+            stats = {stage: StageStats(calls, self._seconds[stage]) for stage, calls in self._calls.items()}
+        return dict(sorted(stats.items(), key=lambda item: -item[1].seconds))
+    
+    def summary(self) -> str:
+        """Stats as a text table, one stage per line."""
+        stats = self.stats()
+        overall = sum(stage.seconds for stage in stats.values())
+        lines = [f"{'stage':<24} {'calls':>10} {'total s':>10} {'mean us':>9} {'share':>7}"]
+        for name, stage in stats.items():
+            share = stage.seconds / overall if overall else 0.0
+            lines.append(
+                f"{name:<24} {stage.calls:>10} {stage.seconds:>10.4f} "
+                f"{stage.mean_us:>9.2f} {share:>7.1%}"
+            )
+        return '\n'.join(lines)
 
 
 class FiscalCodeGenerator:
@@ -36,6 +323,20 @@ class FiscalCodeGenerator:
         'U': 20, 'V': 21, 'W': 22, 'X': 23, 'Y': 24, 'Z': 25
     }
     
+    # Month letter -> month number
+    MONTH_NUMBERS = {letter: month for month, letter in MONTH_MAP.items()}
+    
+    # Omocodia: letters replacing digits 0-9 when two people share a code,
+    # and the digit positions in substitution order (rightmost first)
+    OMOCODE_LETTERS = 'LMNPQRSTUV'
+    OMOCODE_POSITIONS = (14, 13, 12, 10, 9, 7, 6)
+    
+    # Value of a digit position, including omocodia substitution letters
+    DIGIT_VALUES = {
+        '0': 0, '1': 1, '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
+        'L': 0, 'M': 1, 'N': 2, 'P': 3, 'Q': 4, 'R': 5, 'S': 6, 'T': 7, 'U': 8, 'V': 9
+    }
+    
     REMAINDER_MAP = {
         0: 'A', 1: 'B', 2: 'C', 3: 'D', 4: 'E', 5: 'F',
         6: 'G', 7: 'H', 8: 'I', 9: 'J', 10: 'K', 11: 'L',
@@ -44,23 +345,127 @@ class FiscalCodeGenerator:
         24: 'Y', 25: 'Z'
     }
     
+    # The same tables compiled for bytes.translate: each byte of the code
+    # maps to its weight (0 outside the tables), so summing the translated
+    # odd and even positions gives the check total without per-character
+    # dict lookups. Check letters are indexed by remainder.
+    ODD_WEIGHTS = _weight_table(ODD_MAP)
+    EVEN_WEIGHTS = _weight_table(EVEN_MAP)
+    CHECK_LETTERS = ''.join(REMAINDER_MAP.values())
+    
+    # Optional memoization of surname/name codes and parsed dates; off
+    # until enable_cache() is called
+    _surname_cache: Optional[LRUCache] = None
+    _name_cache: Optional[LRUCache] = None
+    _date_cache: Optional[LRUCache] = None
+    
+    @classmethod
+    def enable_cache(cls, capacity: int = DEFAULT_CACHE_CAPACITY):
+        """
+        Memoize surname codes, name codes and parsed birth dates.
+        
+        Each component gets its own LRU cache of the given capacity.
+        Worth turning on for batch runs, where names repeat a lot.
+        """
+        cls._surname_cache = LRUCache(capacity)
+        cls._name_cache = LRUCache(capacity)
+        cls._date_cache = LRUCache(capacity)
+    
+    @classmethod
+    def disable_cache(cls):
+        """Stop memoizing and drop the caches."""
+        cls._surname_cache = cls._name_cache = cls._date_cache = None
+    
+    @classmethod
+    def clear_cache(cls):
+        """Empty the caches and reset their counters, keeping them enabled."""
+        for cache in (cls._surname_cache, cls._name_cache, cls._date_cache):
+            if cache is not None:
+                cache.clear()
+    
+    @classmethod
+    def _caches(cls) -> Dict[str, LRUCache]:
+        """Enabled component caches, keyed as in cache_stats."""
+        caches = {
+            'surname': cls._surname_cache,
+            'name': cls._name_cache,
+            'birth_date': cls._date_cache,
+        }
+        return {key: cache for key, cache in caches.items() if cache is not None}
+    
+    @classmethod
+    def cache_stats(cls) -> Dict[str, CacheStats]:
+        """Counters per component cache, empty when caching is disabled."""
+        return {key: cache.stats() for key, cache in cls._caches().items()}
+    
+    # Optional per-stage timing; off (and free, beyond one None check per
+    # call) until enable_profiling() is called
+    _profiler: Optional[StageProfiler] = None
+    
+    @classmethod
+    def enable_profiling(cls) -> StageProfiler:
+        """
+        Time every stage of generate and generate_many.
+        
+        While enabled, generate_many runs through the stage methods instead
+        of its inlined fast path, so absolute numbers are somewhat higher
+        than in normal runs; the split between stages is what matters.
+        Work done in generate_parallel worker processes is not recorded.
+        
+        Returns:
+            The installed profiler (kept if profiling was already on)
+        """
+        if cls._profiler is None:
+            cls._profiler = StageProfiler()
+        return cls._profiler
+    
+    @classmethod
+    def disable_profiling(cls):
+        """Stop timing stages and drop the recorded numbers."""
+        cls._profiler = None
+    
+    @classmethod
+    def profile_stats(cls) -> Dict[str, StageStats]:
+        """Timing per stage, empty when profiling is disabled."""
+        return cls._profiler.stats() if cls._profiler is not None else {}
+    
     @staticmethod
-    def extract_consonants(text: str) -> str:
-        """Extract consonants from text, preserving vowels if needed."""
-        consonants = ''.join(c.upper() for c in text if c.upper() in 'BCDFGHJKLMNPQRSTVWXYZ')
-        vowels = ''.join(c.upper() for c in text if c.upper() in 'AEIOU')
-        return consonants, vowels
+    def extract_consonants(text: str) -> Tuple[str, str]:
+        """
+        Extract consonants and vowels from text, in order.
+        
+        Accents are folded (Niccolò -> NICCOLO) and apostrophes, spaces
+        and other separators ignored (D'Angelo -> DANGELO).
+        """
+        letters = text.translate(_LETTERS)
+        return letters.translate(_DROP_VOWELS), letters.translate(_DROP_CONSONANTS)
     
     @staticmethod
     def get_surname_code(surname: str) -> str:
         """Extract 3-character code from surname."""
+        cache = FiscalCodeGenerator._surname_cache
+        if cache is not None:
+            code = cache.get(surname)
+            if code is not None:
+                return code
+        
         consonants, vowels = FiscalCodeGenerator.extract_consonants(surname)
         code = (consonants + vowels)[:3]
-        return code.ljust(3, 'X')  # Pad with X if less than 3 chars
+        code = code.ljust(3, 'X')  # Pad with X if less than 3 chars
+        
+        if cache is not None:
+            cache.put(surname, code)
+        return code
     
     @staticmethod
     def get_name_code(name: str) -> str:
         """Extract 3-character code from first name."""
+        cache = FiscalCodeGenerator._name_cache
+        if cache is not None:
+            code = cache.get(name)
+            if code is not None:
+                return code
+        
         consonants, vowels = FiscalCodeGenerator.extract_consonants(name)
         
         # If 4+ consonants, use 1st, 3rd, 4th; else use first 3 available
@@ -68,11 +473,14 @@ class FiscalCodeGenerator:
             code = consonants[0] + consonants[2] + consonants[3]
         else:
             code = (consonants + vowels)[:3]
+        code = code.ljust(3, 'X')  # Pad with X if less than 3 chars
         
-        return code.ljust(3, 'X')  # Pad with X if less than 3 chars
+        if cache is not None:
+            cache.put(name, code)
+        return code
     
     @staticmethod
-    def get_birth_date_code(birth_date: datetime, gender: str) -> str:
+    def get_birth_date_code(birth_date: date, gender: str) -> str:
         """Generate date portion of fiscal code."""
         year_code = f"{birth_date.year % 100:02d}"
         month_code = FiscalCodeGenerator.MONTH_MAP[birth_date.month]
@@ -86,71 +494,776 @@ class FiscalCodeGenerator:
         return year_code + month_code + day_code
     
     @staticmethod
-    def calculate_check_digit(code: str) -> str:
-        """Calculate the check digit for the fiscal code."""
-        total = 0
-        for i, char in enumerate(code):
-            if (i + 1) % 2 == 1:  # Odd positions (1-indexed)
-                total += FiscalCodeGenerator.ODD_MAP.get(char, 0)
-            else:  # Even positions
-                total += FiscalCodeGenerator.EVEN_MAP.get(char, 0)
+    def calculate_check_digit(code: Union[str, bytes]) -> str:
+        """
+        Calculate the check digit for the fiscal code.
         
-        remainder = total % 26
-        return FiscalCodeGenerator.REMAINDER_MAP[remainder]
+        Accepts the code as str or ASCII bytes; characters outside the
+        conversion tables weigh 0.
+        """
+        if isinstance(code, str):
+            code = code.encode('ascii', 'replace')
+        total = (
+            sum(code[0::2].translate(FiscalCodeGenerator.ODD_WEIGHTS)) +
+            sum(code[1::2].translate(FiscalCodeGenerator.EVEN_WEIGHTS))
+        )
+        return FiscalCodeGenerator.CHECK_LETTERS[total % 26]
+    
+    # Reject well-formed codes the municipality registry does not list; off
+    # (any letter and three digits accepted) until enable_strict_municipalities()
+    _strict_municipalities = False
+    
+    @classmethod
+    def enable_strict_municipalities(cls):
+        """Accept only cadastral codes listed in the municipality registry."""
+        cls._strict_municipalities = True
+    
+    @classmethod
+    def disable_strict_municipalities(cls):
+        """Accept any well-formed cadastral code again."""
+        cls._strict_municipalities = False
+    
+    @classmethod
+    def resolve_municipality(cls, municipality: str) -> str:
+        """
+        Return the cadastral code for a municipality code or name.
+        
+        Codes (a letter and three digits) are used as given, or checked
+        against the municipality registry in strict mode; anything else is
+        looked up by name in the registry.
+        """
+        if not municipality:
+            raise FieldError("Municipality is required", 'municipality_code')
+        code = municipality.upper()
+        if is_municipality_code(code):
+            if cls._strict_municipalities and _load_registry().get(code) is None:
+                raise FieldError(f"Unknown municipality code '{code}'", 'municipality_code')
+            return code
+        registry = _load_registry()
+        try:
+            return registry.resolve(municipality)
+        except ValueError as e:
+            raise FieldError(str(e), 'municipality_code') from None
     
     @classmethod
     def generate(
         cls,
         surname: str,
         name: str,
-        birth_date: datetime,
+        birth_date: date,
         gender: str,
         municipality_code: str
-    ) -> str:
+    ) -> 'FiscalCode':
         """
         Generate Italian fiscal code.
         
         Args:
             surname: Family name
             name: First name
-            birth_date: Date of birth
+            birth_date: Date of birth (date or datetime)
             gender: 'M' for male, 'F' for female
-            municipality_code: 4-character municipality code (e.g., 'A123')
+            municipality_code: Cadastral code (e.g., 'H501') or municipality
+                name (e.g., 'Roma', or 'Name (PR)' for homonyms)
             
         Returns:
-            16-character fiscal code
+            16-character fiscal code, as a FiscalCode string
         """
+        profiler = cls._profiler
+        if profiler is not None:
+            return cls._generate_profiled(profiler, surname, name, birth_date, gender, municipality_code)
+        
         # Validate inputs
-        if not surname or not name:
-            raise ValueError("Surname and name are required")
-        if not isinstance(birth_date, datetime):
-            raise ValueError("Birth date must be a datetime object")
-        if gender.upper() not in ['M', 'F']:
-            raise ValueError("Gender must be 'M' or 'F'")
-        if len(municipality_code) != 4:
-            raise ValueError("Municipality code must be 4 characters")
+        municipality_code = cls.check_inputs(surname, name, birth_date, gender, municipality_code)
         
         # Build the code
         code = (
             cls.get_surname_code(surname) +
             cls.get_name_code(name) +
             cls.get_birth_date_code(birth_date, gender) +
-            municipality_code.upper()
+            municipality_code
         )
         
         # Add check digit
         check_digit = cls.calculate_check_digit(code)
         fiscal_code = code + check_digit
         
-        return fiscal_code
+        return FiscalCode(fiscal_code)
+    
+    @classmethod
+    def check_inputs(
+        cls,
+        surname: str,
+        name: str,
+        birth_date: date,
+        gender: str,
+        municipality_code: str
+    ) -> str:
+        """
+        Validate the arguments of generate.
+        
+        Returns:
+            The resolved cadastral code
+            
+        Raises:
+            FieldError: If an input is missing or invalid
+        """
+        if not surname or not name:
+            raise FieldError("Surname and name are required", 'surname' if not surname else 'name')
+        if not isinstance(birth_date, date):
+            raise FieldError("Birth date must be a date or datetime object", 'birth_date')
+        if gender.upper() not in ['M', 'F']:
+            raise FieldError("Gender must be 'M' or 'F'", 'gender')
+        return cls.resolve_municipality(municipality_code)
+    
+    @classmethod
+    def _generate_profiled(
+        cls,
+        profiler: StageProfiler,
+        surname: str,
+        name: str,
+        birth_date: date,
+        gender: str,
+        municipality_code: str
+    ) -> 'FiscalCode':
+        """generate, with every stage timed by profiler."""
+        call = profiler.call
+        municipality_code = call('validation', cls.check_inputs, surname, name, birth_date, gender, municipality_code)
+        code = (
+            call('get_surname_code', cls.get_surname_code, surname) +
+            call('get_name_code', cls.get_name_code, name) +
+            call('get_birth_date_code', cls.get_birth_date_code, birth_date, gender) +
+            municipality_code
+        )
+        return FiscalCode(code + call('calculate_check_digit', cls.calculate_check_digit, code))
+    
+    @classmethod
+    def generate_many(cls, records: Iterable[Any]) -> Iterator[BatchResult]:
+        """
+        Generate fiscal codes for many records lazily.
+        
+        Each record is either a tuple in RECORD_FIELDS order or a dict keyed
+        by those names. The birth date may be a date, a datetime or a string
+        accepted by parse_date, and the municipality a code or name as for generate().
+        Invalid rows do not stop the run: their BatchResult carries
+        the error message instead of a code. A ValueError instance in place
+        of a record is reported as that row's error, so readers can pass
+        unparseable lines through in sequence.
+        
+        Args:
+            records: Iterable of tuples or dicts
+            
+        Yields:
+            BatchResult for each record, in input order
+        """
+        profiler = cls._profiler
+        if profiler is not None:
+            yield from cls._generate_many_profiled(profiler, records)
+            return
+        
+        # Bind every table and helper once so the per-row path is only
+        # local lookups and string concatenation.
+        letter_table = _LETTERS
+        drop_vowels = _DROP_VOWELS
+        drop_consonants = _DROP_CONSONANTS
+        upper = _ASCII_UPPER
+        not_consonant = _NOT_CONSONANT
+        not_vowel = _NOT_VOWEL
+        odd_weights = cls.ODD_WEIGHTS
+        even_weights = cls.EVEN_WEIGHTS
+        check_letters = cls.CHECK_LETTERS
+        year_codes = [f"{y:02d}" for y in range(100)]
+        month_codes = [''] + [cls.MONTH_MAP[m] for m in range(1, 13)]
+        day_codes = {
+            'M': [f"{d:02d}" for d in range(32)],
+            'F': [f"{d + 40:02d}" for d in range(32)],
+        }
+        surname_cache = cls._surname_cache
+        name_cache = cls._name_cache
+        # Values repeat a lot within a batch: date strings and municipalities
+        # are resolved once per batch. Date strings are sliced in place
+        # unless parsed dates are cached, where every row goes through
+        # parse_date so the cache and its counters stay in use.
+        if cls._date_cache is None:
+            split_date, date_memo_size = _split_date, _BATCH_MEMO_SIZE
+        else:
+            split_date, date_memo_size = _parsed_date_fields, 0
+        date_memo = {}
+        municipality_memo = {}
+        fields = RECORD_FIELDS
+        is_code = is_municipality_code
+        strict = cls._strict_municipalities
+        resolve_municipality = cls.resolve_municipality
+        
+        for index, record in enumerate(records):
+            try:
+                if isinstance(record, dict):
+                    surname, name, birth_date, gender, municipality_code = (
+                        record.get(field) for field in fields
+                    )
+                elif isinstance(record, ValueError):
+                    raise record
+                else:
+                    surname, name, birth_date, gender, municipality_code = record
+                
+                if not surname or not name:
+                    raise FieldError("Surname and name are required", 'surname' if not surname else 'name')
+                if isinstance(birth_date, str):
+                    date_fields = date_memo.get(birth_date)
+                    if date_fields is None:
+                        date_fields = split_date(birth_date)
+                        if len(date_memo) < date_memo_size:
+                            date_memo[birth_date] = date_fields
+                    year, month, day = date_fields
+                elif isinstance(birth_date, date):
+                    year, month, day = birth_date.year, birth_date.month, birth_date.day
+                else:
+                    raise FieldError("Birth date must be a date or datetime object", 'birth_date')
+                gender = (gender or '').upper()
+                day_table = day_codes.get(gender)
+                if day_table is None:
+                    raise FieldError("Gender must be 'M' or 'F'", 'gender')
+                resolved = municipality_memo.get(municipality_code)
+                if resolved is None:
+                    if not municipality_code:
+                        raise FieldError("Municipality is required", 'municipality_code')
+                    upper_code = municipality_code.upper()
+                    if is_code(upper_code) and not strict:
+                        resolved = upper_code
+                    else:
+                        resolved = resolve_municipality(municipality_code)
+                    if len(municipality_memo) < _BATCH_MEMO_SIZE:
+                        municipality_memo[municipality_code] = resolved
+                municipality_code = resolved
+                
+                # Same rules (and caches) as get_surname_code/get_name_code,
+                # inlined; ASCII names take the bytes tables, others the
+                # accent-folding _LETTERS table
+                surname_code = surname_cache.get(surname) if surname_cache is not None else None
+                if surname_code is None:
+                    if surname.isascii():
+                        text = surname.encode('ascii')
+                        surname_code = (
+                            text.translate(upper, not_consonant) +
+                            text.translate(upper, not_vowel)
+                        )[:3].ljust(3, b'X').decode('ascii')
+                    else:
+                        letters = surname.translate(letter_table)
+                        surname_code = (
+                            letters.translate(drop_vowels) +
+                            letters.translate(drop_consonants)
+                        )[:3].ljust(3, 'X')
+                    if surname_cache is not None:
+                        surname_cache.put(surname, surname_code)
+                
+                name_code = name_cache.get(name) if name_cache is not None else None
+                if name_code is None:
+                    if name.isascii():
+                        text = name.encode('ascii')
+                        consonants = text.translate(upper, not_consonant)
+                        if len(consonants) >= 4:
+                            name_code = consonants[0:1] + consonants[2:4]
+                        else:
+                            name_code = (
+                                consonants + text.translate(upper, not_vowel)
+                            )[:3].ljust(3, b'X')
+                        name_code = name_code.decode('ascii')
+                    else:
+                        letters = name.translate(letter_table)
+                        consonants = letters.translate(drop_vowels)
+                        if len(consonants) >= 4:
+                            name_code = consonants[0] + consonants[2:4]
+                        else:
+                            name_code = (
+                                consonants + letters.translate(drop_consonants)
+                            )[:3].ljust(3, 'X')
+                    if name_cache is not None:
+                        name_cache.put(name, name_code)
+                
+                code = (
+                    surname_code + name_code +
+                    year_codes[year % 100] +
+                    month_codes[month] +
+                    day_table[day] +
+                    municipality_code
+                )
+                
+                raw = code.encode('ascii', 'replace')
+                total = (sum(raw[0::2].translate(odd_weights)) +
+                         sum(raw[1::2].translate(even_weights)))
+                
+                yield BatchResult(index, code + check_letters[total % 26], None)
+            except (ValueError, TypeError, AttributeError) as e:
+                yield BatchResult(index, None, str(e), getattr(e, 'field', None))
+    
+    @classmethod
+    def _generate_many_profiled(cls, profiler: StageProfiler, records: Iterable[Any]) -> Iterator[BatchResult]:
+        """generate_many through the timed stage methods of generate."""
+        fields = RECORD_FIELDS
+        for index, record in enumerate(records):
+            try:
+                if isinstance(record, dict):
+                    surname, name, birth_date, gender, municipality_code = (
+                        record.get(field) for field in fields
+                    )
+                elif isinstance(record, ValueError):
+                    raise record
+                else:
+                    surname, name, birth_date, gender, municipality_code = record
+                
+                # Names are checked first, as in the fast path
+                if surname and name and isinstance(birth_date, str):
+                    birth_date = profiler.call('parse_date', parse_date, birth_date)
+                fiscal_code = cls._generate_profiled(
+                    profiler, surname, name, birth_date, gender or '', municipality_code
+                )
+                yield BatchResult(index, fiscal_code, None)
+            except (ValueError, TypeError, AttributeError) as e:
+                yield BatchResult(index, None, str(e), getattr(e, 'field', None))
+    
+    @classmethod
+    def generate_parallel(
+        cls,
+        records: Iterable[Any],
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[BatchResult]:
+        """
+        Generate fiscal codes for many records on a pool of processes.
+        
+        Input is cut into chunks of chunk_size records which run through
+        generate_many in worker processes; results come back in input
+        order. Only a few chunks per worker are in flight at once, so
+        memory stays bounded for any input size. Inputs that fit in a
+        single chunk, or a single worker, run in-process since pool
+        startup would cost more than it saves.
+        
+        When caching is enabled each worker gets caches of the same
+        capacity, and their hits, misses and evictions are added to the
+        counters reported by cache_stats.
+        
+        Args:
+            records: Iterable of tuples or dicts, as for generate_many
+            workers: Number of processes (default: CPU count)
+            chunk_size: Records per task
+            
+        Yields:
+            BatchResult for each record, in input order
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+        workers = workers or os.cpu_count() or 1
+        
+        iterator = iter(records)
+        chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+        first = next(chunks, None)
+        if first is None:
+            return
+        second = next(chunks, None)
+        if workers == 1 or second is None:
+            yield from cls.generate_many(chain(first, second or (), iterator))
+            return
+        
+        # Imported here: multiprocessing would slow every import of this module
+        from concurrent.futures import ProcessPoolExecutor
+        
+        caches = cls._caches()
+        capacity = next(iter(caches.values())).capacity if caches else 0
+        settings = (capacity, cls._strict_municipalities)
+        
+        def collect(future):
+            """Rows of a finished chunk, after counting its cache lookups here."""
+            rows, counts = future.result()
+            for key, (hits, misses, evictions) in counts.items():
+                cache = caches.get(key)
+                if cache is not None:
+                    cache.hits += hits
+                    cache.misses += misses
+                    cache.evictions += evictions
+            return rows
+        
+        index = 0
+        pending = deque()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=settings
+        ) as pool:
+            for chunk in chain((first, second), chunks):
+                pending.append(pool.submit(_generate_chunk, chunk))
+                if len(pending) < workers * 2:
+                    continue
+                for fiscal_code, error, field in collect(pending.popleft()):
+                    yield BatchResult(index, fiscal_code, error, field)
+                    index += 1
+            while pending:
+                for fiscal_code, error, field in collect(pending.popleft()):
+                    yield BatchResult(index, fiscal_code, error, field)
+                    index += 1
+    
+    @classmethod
+    def validate(cls, code: str) -> bool:
+        """
+        Check whether a fiscal code is well formed.
+        
+        Checks the structure, month letter, day range (1-31, or 41-71 for
+        women, within the month; 29 February only when the two-digit year
+        is divisible by 4) and check digit. This is the fast path for bulk
+        verification; use decode() to learn why a code is rejected.
+        Codes are expected in upper case.
+        """
+        if len(code) != 16 or _CODE_PATTERN.match(code) is None:
+            return False
+        month = cls.MONTH_NUMBERS.get(code[8])
+        if month is None:
+            return False
+        digits = cls.DIGIT_VALUES
+        day = digits[code[9]] * 10 + digits[code[10]]
+        if day > 40:
+            day -= 40
+        if not 1 <= day <= _DAYS_IN_MONTH[month]:
+            return False
+        if day == 29 and month == 2 and (digits[code[6]] * 10 + digits[code[7]]) % 4:
+            return False
+        raw = code.encode('ascii')
+        total = (
+            sum(raw[0:15:2].translate(cls.ODD_WEIGHTS)) +
+            sum(raw[1:15:2].translate(cls.EVEN_WEIGHTS))
+        )
+        return cls.CHECK_LETTERS[total % 26] == code[15]
+    
+    @classmethod
+    def decode(cls, code: str) -> DecodedFiscalCode:
+        """
+        Validate a fiscal code and extract birth date, gender and municipality.
+        
+        The two-digit year is placed in the most recent century that does
+        not put the birth date in the future.
+        
+        Args:
+            code: 16-character fiscal code (case insensitive)
+            
+        Returns:
+            DecodedFiscalCode with the personal data
+            
+        Raises:
+            ValueError: If the code is malformed, naming the failed check
+        """
+        code = code.upper()
+        if len(code) != 16:
+            raise ValueError("Fiscal code must be 16 characters")
+        if _CODE_PATTERN.match(code) is None:
+            raise ValueError("Invalid fiscal code format")
+        
+        month = cls.MONTH_NUMBERS.get(code[8])
+        if month is None:
+            raise ValueError(f"Invalid month letter '{code[8]}'")
+        
+        digits = cls.DIGIT_VALUES
+        day = digits[code[9]] * 10 + digits[code[10]]
+        gender = 'M'
+        if day > 40:
+            day -= 40
+            gender = 'F'
+        if not 1 <= day <= _DAYS_IN_MONTH[month]:
+            raise ValueError("Invalid day of birth")
+        if day == 29 and month == 2 and (digits[code[6]] * 10 + digits[code[7]]) % 4:
+            raise ValueError("Invalid day of birth")
+        
+        if cls.calculate_check_digit(code[:15]) != code[15]:
+            raise ValueError("Invalid check digit")
+        
+        today = datetime.now()
+        year = today.year - today.year % 100 + digits[code[6]] * 10 + digits[code[7]]
+        if (year, month, day) > (today.year, today.month, today.day):
+            year -= 100
+        try:
+            birth_date = datetime(year, month, day)
+        except ValueError:
+            raise ValueError("Invalid day of birth")
+        
+        municipality_code = (
+            code[11] + str(digits[code[12]]) + str(digits[code[13]]) + str(digits[code[14]])
+        )
+        return DecodedFiscalCode(birth_date, gender, municipality_code)
+    
+    @staticmethod
+    def is_omocode(code: str) -> bool:
+        """Check whether any digit position of a code holds a substitution letter."""
+        return _PLAIN_DIGITS_PATTERN.match(code) is None
+    
+    @classmethod
+    def normalize_omocode(cls, code: str) -> str:
+        """
+        Map an omocodic variant back to its base fiscal code.
+        
+        Substitution letters in digit positions become digits again and the
+        check digit is recomputed. Codes without substitutions are returned
+        as they are, without building a new string. Expects an upper-case,
+        structurally valid code.
+        """
+        if _PLAIN_DIGITS_PATTERN.match(code):
+            return code
+        base = (
+            code[:6] + code[6:8].translate(_OMOCODE_TO_DIGIT) + code[8] +
+            code[9:11].translate(_OMOCODE_TO_DIGIT) + code[11] +
+            code[12:15].translate(_OMOCODE_TO_DIGIT)
+        )
+        return base + cls.calculate_check_digit(base)
+    
+    @classmethod
+    def omocode_variants(cls, code: str) -> Iterator[str]:
+        """
+        Enumerate every omocodic variant of a fiscal code.
+        
+        Yields all 128 combinations of substituted digit positions, each
+        with its check digit, starting with the base code. The variant
+        number's bits select positions in OMOCODE_POSITIONS order, so
+        variants 1, 3, 7... follow the official substitution sequence.
+        
+        Args:
+            code: Fiscal code, or any of its variants (case insensitive)
+            
+        Raises:
+            ValueError: If the code is malformed, on the first iteration
+        """
+        code = code.upper()
+        if len(code) != 16:
+            raise ValueError("Fiscal code must be 16 characters")
+        if _CODE_PATTERN.match(code) is None:
+            raise ValueError("Invalid fiscal code format")
+        base = cls.normalize_omocode(code)
+        chars = list(base[:15])
+        positions = cls.OMOCODE_POSITIONS
+        digits = [base[p] for p in positions]
+        letters = [cls.OMOCODE_LETTERS[int(digit)] for digit in digits]
+        
+        # Change of the check total when each position is substituted;
+        # position p is odd in the 1-indexed numbering when p is even
+        deltas = []
+        for p, digit, letter in zip(positions, digits, letters):
+            weights = cls.ODD_MAP if p % 2 == 0 else cls.EVEN_MAP
+            deltas.append(weights[letter] - weights[digit])
+        
+        base_total = cls.CHECK_LETTERS.index(cls.calculate_check_digit(base[:15]))
+        check_letters = cls.CHECK_LETTERS
+        count = len(positions)
+        for variant in range(1 << count):
+            total = base_total
+            for i in range(count):
+                if variant >> i & 1:
+                    chars[positions[i]] = letters[i]
+                    total += deltas[i]
+                else:
+                    chars[positions[i]] = digits[i]
+            yield ''.join(chars) + check_letters[total % 26]
+
+
+class FiscalCode(str):
+    """
+    A fiscal code string that knows its own structure.
+    
+    Behaves exactly like the 16-character str it wraps (hashing,
+    comparison, slicing, JSON). It has no instance __dict__: the
+    breakdown, birth date and gender are derived from the characters each
+    time they are read. Batch APIs keep yielding plain str, which is
+    smaller still; wrap a result with FiscalCode(code) when needed.
+    """
+    
+    __slots__ = ()
+    
+    @classmethod
+    def parse(cls, code: str) -> 'FiscalCode':
+        """
+        Validate a code (case insensitive) and wrap it.
+        
+        Raises:
+            ValueError: If the code is malformed, naming the failed check
+        """
+        code = code.strip().upper()
+        FiscalCodeGenerator.decode(code)
+        return cls(code)
+    
+    def __repr__(self) -> str:
+        return f"FiscalCode({str.__repr__(self)})"
+    
+    @property
+    def breakdown(self) -> CodeBreakdown:
+        """The code split into its components."""
+        return CodeBreakdown(
+            self[0:3], self[3:6], self[6:8], self[8], self[9:11], self[11:15], self[15]
+        )
+    
+    @property
+    def decoded(self) -> DecodedFiscalCode:
+        """Birth date, gender and municipality (see FiscalCodeGenerator.decode)."""
+        return FiscalCodeGenerator.decode(self)
+    
+    @property
+    def birth_date(self) -> datetime:
+        """Date of birth, with the century inferred as in decode."""
+        return self.decoded.birth_date
+    
+    @property
+    def gender(self) -> str:
+        """'M' or 'F'."""
+        day = FiscalCodeGenerator.DIGIT_VALUES[self[9]]
+        return 'F' if day >= 4 else 'M'
+    
+    @property
+    def municipality_code(self) -> str:
+        """Cadastral code of the place of birth, omocodia substitutions undone."""
+        return self[11] + self[12:15].translate(_OMOCODE_TO_DIGIT)
+    
+    def describe(self) -> str:
+        """The breakdown as labelled lines, as shown by the CLI and the GUI."""
+        return '\n'.join(
+            f"{label + ':':<20}{value}" for label, value in zip(BREAKDOWN_LABELS, self.breakdown)
+        )
+
+
+def pack_code(code: str) -> int:
+    """
+    Pack a fiscal code into an integer below 2**63.
+    
+    The fields are stored in mixed radix: six name letters, two-digit year,
+    month, day (with the female offset) and cadastral code. The check
+    digit is dropped since unpack_code can recompute it.
+    
+    Raises:
+        ValueError: If the code is invalid or omocodic (substituted digits
+            do not fit; store those separately)
+    """
+    if not FiscalCodeGenerator.validate(code):
+        raise ValueError("Invalid fiscal code")
+    if FiscalCodeGenerator.is_omocode(code):
+        raise ValueError("Omocodic codes cannot be packed")
+    return _pack_plain(code)
 
 
-def parse_date(date_str: str) -> datetime:
-    """Parse date string in DD/MM/YYYY format."""
+def _pack_plain(code: str) -> int:
+    """pack_code without its checks, for codes known valid and not omocodic."""
+    raw = code.encode('ascii')
+    value = 0
+    for letter in raw[:6]:
+        value = value * 26 + letter - 65
+    value = value * 100 + (raw[6] - 48) * 10 + raw[7] - 48
+    value = value * 12 + FiscalCodeGenerator.MONTH_NUMBERS[code[8]] - 1
+    day = (raw[9] - 48) * 10 + raw[10] - 48
+    value = value * 62 + (day - 10 if day > 40 else day - 1)
+    return value * 26000 + (raw[11] - 65) * 1000 + int(code[12:15])
+
+
+def unpack_code(value: int) -> str:
+    """Rebuild the fiscal code packed by pack_code, check digit included."""
+    value, municipality = divmod(value, 26000)
+    value, day = divmod(value, 62)
+    value, month = divmod(value, 12)
+    value, year = divmod(value, 100)
+    letters = []
+    for _ in range(6):
+        value, letter = divmod(value, 26)
+        letters.append(chr(letter + 65))
+    letter, digits = divmod(municipality, 1000)
+    code = (
+        ''.join(reversed(letters)) +
+        f"{year:02d}" +
+        FiscalCodeGenerator.MONTH_MAP[month + 1] +
+        f"{day + 10 if day > 30 else day + 1:02d}" +
+        chr(letter + 65) + f"{digits:03d}"
+    )
+    return code + FiscalCodeGenerator.calculate_check_digit(code)
+
+
+def _init_worker(cache_capacity: int, strict_municipalities: bool):
+    """Process-pool initializer: mirror the parent's cache capacity and municipality mode."""
+    if cache_capacity > 0:
+        FiscalCodeGenerator.enable_cache(cache_capacity)
+    else:
+        FiscalCodeGenerator.disable_cache()
+    FiscalCodeGenerator._strict_municipalities = strict_municipalities
+
+
+def _generate_chunk(
+    chunk: List[Any]
+) -> Tuple[List[Tuple[Optional[str], Optional[str], Optional[str]]], Dict[str, Tuple[int, int, int]]]:
+    """
+    Process-pool task: generate one chunk, dropping the local indexes.
+    
+    Returns:
+        Tuple of (rows, counts): (fiscal_code, error, field) per record, and
+        the (hits, misses, evictions) this chunk added to each cache
+    """
+    before = FiscalCodeGenerator.cache_stats()
+    rows = [
+        (result.fiscal_code, result.error, result.field)
+        for result in FiscalCodeGenerator.generate_many(chunk)
+    ]
+    counts = {
+        key: (
+            stats.hits - before[key].hits,
+            stats.misses - before[key].misses,
+            stats.evictions - before[key].evictions,
+        )
+        for key, stats in FiscalCodeGenerator.cache_stats().items()
+    }
+    return rows, counts
+
+
+def _split_date(date_str: str) -> Tuple[int, int, int]:
+    """
+    (year, month, day) of a date string, as parse_date reads it.
+    
+    The common DD/MM/YYYY shape is read through _DAY_MONTHS and the year
+    digits, without regex matching or building a datetime; anything else,
+    invalid dates included, goes through parse_date.
+    """
+    month_day = _DAY_MONTHS.get(date_str[:6])
+    if month_day is not None and len(date_str) == 10:
+        year_str = date_str[6:]
+        if year_str.isdigit() and year_str.isascii():
+            year = int(year_str)
+            month, day = month_day
+            if year and (day != 29 or month != 2 or year % 4 == 0 and (year % 100 or year % 400 == 0)):
+                return year, month, day
+    return _parsed_date_fields(date_str)
+
+
+def _parsed_date_fields(date_str: str) -> Tuple[int, int, int]:
+    """(year, month, day) of a date string through parse_date."""
+    parsed = parse_date(date_str)
+    return parsed.year, parsed.month, parsed.day
+
+
+def parse_date(date_str: Union[str, date]) -> datetime:
+    """
+    Parse a date in DD/MM/YYYY (or ISO YYYY-MM-DD) format.
+    
+    date and datetime objects are accepted as well and returned as a
+    datetime. Uses precompiled patterns instead of datetime.strptime,
+    which goes through the locale-aware _strptime machinery on every call.
+    """
+    if isinstance(date_str, datetime):
+        return date_str
+    if isinstance(date_str, date):
+        return datetime(date_str.year, date_str.month, date_str.day)
+    
+    cache = FiscalCodeGenerator._date_cache
+    if cache is not None:
+        parsed = cache.get(date_str)
+        if parsed is not None:
+            return parsed
+    
     try:
-        return datetime.strptime(date_str, "%d/%m/%Y")
-    except ValueError:
-        raise ValueError(f"Invalid date format. Use DD/MM/YYYY")
+        match = _DMY_PATTERN.fullmatch(date_str)
+        if match is not None:
+            day, month, year = match.groups()
+        else:
+            year, month, day = _ISO_DATE_PATTERN.fullmatch(date_str).groups()
+        parsed = datetime(int(year), int(month), int(day))
+    except (ValueError, TypeError, AttributeError):
+        raise FieldError("Invalid date format. Use DD/MM/YYYY", 'birth_date')
+    
+    if cache is not None:
+        cache.put(date_str, parsed)
+    return parsed
 
 
 def print_header():
@@ -188,13 +1301,198 @@ def get_user_input() -> Tuple[str, str, datetime, str, str]:
             break
         print("❌ Please enter 'M' or 'F'")
     
-    municipality_code = input("Municipality Code (e.g., A123): ").strip()
+    municipality_code = input("Municipality (code or name, e.g., H501 or Roma): ").strip()
     
     return surname, name, birth_date, gender, municipality_code
 
 
-def main():
+def _read_jsonl(stream: TextIO) -> Iterator[Any]:
+    """
+    Yield one decoded record per non-empty JSON Lines row.
+    
+    Rows must be objects or arrays of len(RECORD_FIELDS) values; anything
+    else, like bad JSON, is yielded as a ValueError for generate_many.
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+            continue
+        if isinstance(record, dict) or (
+            isinstance(record, list) and len(record) == len(RECORD_FIELDS)
+        ):
+            yield record
+        else:
+            yield ValueError("Each record must be a JSON object or array")
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[Any]:
+    """
+    Read batch records from a CSV or JSON Lines stream, one at a time.
+    
+    CSV input needs a header row naming the RECORD_FIELDS columns. JSON
+    Lines input holds one object (keyed like RECORD_FIELDS) or array per
+    line. Lines that cannot be parsed are yielded as ValueError so they
+    show up as per-row errors.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        missing = set(RECORD_FIELDS) - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"CSV header is missing columns: {', '.join(sorted(missing))}")
+        return reader
+    return _read_jsonl(stream)
+
+
+def write_results(results: Iterable[BatchResult], stream: TextIO, fmt: str) -> Tuple[int, int]:
+    """
+    Write batch results as CSV or JSON Lines while they are produced.
+    
+    Returns:
+        Tuple of (rows written, rows with errors)
+    """
+    rows = errors = 0
+    if fmt == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(('index', 'fiscal_code', 'error'))
+        for result in results:
+            writer.writerow((result.index, result.fiscal_code, result.error))
+            rows += 1
+            errors += result.error is not None
+    else:
+        dumps = json.dumps
+        for result in results:
+            stream.write(dumps({
+                'index': result.index, 'fiscal_code': result.fiscal_code, 'error': result.error
+            }) + '\n')
+            rows += 1
+            errors += result.error is not None
+    return rows, errors
+
+
+def run_batch(
+    input_path: str,
+    output_path: Optional[str],
+    fmt: Optional[str],
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache_size: int = 0,
+    profile: bool = False,
+    strict_municipalities: bool = False
+) -> int:
+    """Generate codes for every record of a CSV/JSONL file or stdin."""
+    if strict_municipalities:
+        FiscalCodeGenerator.enable_strict_municipalities()
+    if cache_size > 0:
+        FiscalCodeGenerator.enable_cache(cache_size)
+    if profile:
+        if workers != 1:
+            print("Profiling only covers in-process work; running with 1 worker", file=sys.stderr)
+            workers = 1
+        FiscalCodeGenerator.enable_profiling()
+
+    if fmt is None:
+        fmt = 'jsonl' if input_path.endswith(('.jsonl', '.ndjson')) else 'csv'
+    
+    try:
+        in_stream = sys.stdin if input_path == '-' else open(input_path, newline='', encoding='utf-8')
+    except OSError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    try:
+        out_stream = sys.stdout if output_path in (None, '-') else open(output_path, 'w', newline='', encoding='utf-8')
+    except OSError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        in_stream.close()
+        return 1
+    
+    try:
+        start = time.perf_counter()
+        records = read_records(in_stream, fmt)
+        if workers == 1:
+            results = FiscalCodeGenerator.generate_many(records)
+        else:
+            results = FiscalCodeGenerator.generate_parallel(records, workers or None, chunk_size)
+        rows, errors = write_results(results, out_stream, fmt)
+        elapsed = time.perf_counter() - start
+    except ValueError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+    
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Processed {rows} rows ({errors} errors) in {elapsed:.3f}s "
+        f"- {rate:,.0f} rows/s",
+        file=sys.stderr
+    )
+    for component, stats in FiscalCodeGenerator.cache_stats().items():
+        print(
+            f"Cache {component}: {stats.hits} hits, {stats.misses} misses, "
+            f"{stats.evictions} evictions ({stats.hit_rate:.1%} hit rate)",
+            file=sys.stderr
+        )
+    print_profile()
+    return 0
+
+
+def print_profile():
+    """Print the stage timings to stderr, if profiling is enabled."""
+    profiler = FiscalCodeGenerator._profiler
+    if profiler is not None:
+        print("\nStage profile:", file=sys.stderr)
+        print(profiler.summary(), file=sys.stderr)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Italian fiscal code calculator. Runs interactively "
+                    "unless --input is given."
+    )
+    parser.add_argument('-i', '--input', help="CSV or JSONL file to process in batch ('-' for stdin)")
+    parser.add_argument('-o', '--output', help="Where to write results (default: stdout)")
+    parser.add_argument('-f', '--format', choices=('csv', 'jsonl'),
+                        help="Input and output format (default: from the input file extension, else csv)")
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help="Worker processes for batch mode (0 = one per CPU, default: 1)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Records per worker task (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--cache', type=int, default=0, metavar='SIZE',
+                        help="Memoize name codes and dates in LRU caches of SIZE entries (default: off)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Time each generation stage and print a summary to stderr")
+    parser.add_argument('--strict-municipalities', action='store_true',
+                        help="Reject municipality codes missing from the registry")
+    args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
     """Main application loop."""
+    args = parse_args(argv)
+    if args.input:
+        return run_batch(
+            args.input, args.output, args.format, args.workers, args.chunk_size, args.cache, args.profile,
+            args.strict_municipalities
+        )
+    
+    if args.strict_municipalities:
+        FiscalCodeGenerator.enable_strict_municipalities()
+    if args.profile:
+        FiscalCodeGenerator.enable_profiling()
     print_header()
     
     try:
@@ -213,14 +1511,10 @@ def main():
         
         # Display breakdown
         print("Code Breakdown:")
-        print(f"  Surname Code:       {fiscal_code[0:3]}")
-        print(f"  Name Code:          {fiscal_code[3:6]}")
-        print(f"  Year of Birth:      {fiscal_code[6:8]}")
-        print(f"  Month:              {fiscal_code[8]}")
-        print(f"  Day (+ 40 if F):    {fiscal_code[9:11]}")
-        print(f"  Municipality:       {fiscal_code[11:15]}")
-        print(f"  Check Digit:        {fiscal_code[15]}")
+        for line in fiscal_code.describe().splitlines():
+            print(f"  {line}")
         print()
+        print_profile()
         
     except ValueError as e:
         print(f"\n❌ Error: {e}\n")
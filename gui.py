@@ -4,9 +4,24 @@ A modern, minimal desktop application for calculating Italian fiscal codes.
 """
 
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, messagebox
 from datetime import datetime
-from fiscalcode import FiscalCodeGenerator, parse_date
+from fiscalcode import FiscalCode, FiscalCodeGenerator, parse_date
+from municipalities import get_registry, is_municipality_code
+
+
+# Quiet period after the last keystroke before the code is recomputed
+DEBOUNCE_MS = 250
+
+# How often a pending municipality lookup is checked for completion
+LOOKUP_POLL_MS = 20
+
+VALID_COLOR = "#27ae60"
+ERROR_COLOR = "#c0392b"
+PENDING_COLOR = "#7f8c8d"
+
+REQUIRED = "Required"
 
 
 class FiscalCodeGUI:
@@ -30,8 +45,23 @@ class FiscalCodeGUI:
         root.rowconfigure(0, weight=1)
         self.main_frame.columnconfigure(0, weight=1)
         
+        # Live updates: last input and result per component, the pending
+        # debounce timer, and a worker thread for registry lookups so the
+        # CSV load and name search never block the event loop
+        self._components = {}
+        self._pending_update = None
+        self._pending_lookup = None
+        # Generate was pressed while a lookup ran: report once it finishes
+        self._generate_pending = False
+        self._lookups = ThreadPoolExecutor(max_workers=1, thread_name_prefix='municipality-lookup')
+        self._lookups.submit(get_registry)
+        
         # Build UI
         self.build_ui()
+        
+        for var in (self.surname_var, self.name_var, self.date_var, self.gender_var, self.municipality_var):
+            var.trace_add('write', self.schedule_update)
+        root.protocol("WM_DELETE_WINDOW", self.close)
     
     def setup_styles(self):
         """Configure the visual style of the application."""
@@ -77,18 +107,21 @@ class FiscalCodeGUI:
         
         # Surname
         ttk.Label(self.main_frame, text="Surname (Cognome)").grid(row=row, column=0, sticky=tk.W, pady=(10, 5))
+        self.surname_status = self.status_label(row)
         self.surname_var = tk.StringVar()
         ttk.Entry(self.main_frame, textvariable=self.surname_var, width=40).grid(row=row+1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
         row += 2
         
         # First Name
         ttk.Label(self.main_frame, text="First Name (Nome)").grid(row=row, column=0, sticky=tk.W, pady=(10, 5))
+        self.name_status = self.status_label(row)
         self.name_var = tk.StringVar()
         ttk.Entry(self.main_frame, textvariable=self.name_var, width=40).grid(row=row+1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
         row += 2
         
         # Date of Birth
         ttk.Label(self.main_frame, text="Date of Birth (DD/MM/YYYY)").grid(row=row, column=0, sticky=tk.W, pady=(10, 5))
+        self.date_status = self.status_label(row)
         self.date_var = tk.StringVar()
         ttk.Entry(self.main_frame, textvariable=self.date_var, width=40).grid(row=row+1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
         row += 2
@@ -103,7 +136,8 @@ class FiscalCodeGUI:
         row += 2
         
         # Municipality Code
-        ttk.Label(self.main_frame, text="Municipality Code (e.g., A123)").grid(row=row, column=0, sticky=tk.W, pady=(10, 5))
+        ttk.Label(self.main_frame, text="Municipality (code or name, e.g., H501 or Roma)").grid(row=row, column=0, sticky=tk.W, pady=(10, 5))
+        self.municipality_status = self.status_label(row)
         self.municipality_var = tk.StringVar()
         ttk.Entry(self.main_frame, textvariable=self.municipality_var, width=40).grid(row=row+1, column=0, sticky=(tk.W, tk.E), pady=(0, 15))
         row += 2
@@ -175,63 +209,168 @@ class FiscalCodeGUI:
         scrollbar.grid(row=2, column=2, sticky=(tk.N, tk.S), padx=(5, 0))
         self.breakdown_text.config(yscrollcommand=scrollbar.set)
     
-    def generate_code(self):
-        """Generate the fiscal code based on input."""
-        try:
-            # Get values
-            surname = self.surname_var.get().strip()
-            name = self.name_var.get().strip()
-            date_str = self.date_var.get().strip()
-            gender = self.gender_var.get()
-            municipality = self.municipality_var.get().strip()
-            
-            # Validate
-            if not surname or not name:
-                messagebox.showerror("Error", "Please enter surname and first name")
-                return
-            
-            if not date_str:
-                messagebox.showerror("Error", "Please enter date of birth")
-                return
-            
-            if not municipality:
-                messagebox.showerror("Error", "Please enter municipality code")
-                return
-            
-            # Parse date
+    def status_label(self, row):
+        """Create the per-field validation label, right-aligned next to the field label."""
+        label = ttk.Label(self.main_frame, text="", font=('Segoe UI', 9))
+        label.grid(row=row, column=0, sticky=tk.E, pady=(10, 5))
+        return label
+    
+    def schedule_update(self, *_):
+        """Recompute after DEBOUNCE_MS of quiet, dropping any update still waiting."""
+        # Editing after Generate drops its deferred report
+        self._generate_pending = False
+        if self._pending_update is not None:
+            self.root.after_cancel(self._pending_update)
+        self._pending_update = self.root.after(DEBOUNCE_MS, self.update_live)
+    
+    def component(self, key, value, compute):
+        """
+        Return (code, error) for one component, computing it only when its
+        input changed since the last call.
+        """
+        cached = self._components.get(key)
+        if cached is not None and cached[0] == value:
+            return cached[1], cached[2]
+        # Tuple inputs (date, gender) are required through their first item
+        required = value[0] if isinstance(value, tuple) else value
+        if not required:
+            code, error = None, REQUIRED
+        else:
             try:
-                birth_date = parse_date(date_str)
+                code, error = compute(value), None
             except ValueError as e:
-                messagebox.showerror("Error", str(e))
-                return
-            
-            # Generate code
-            fiscal_code = FiscalCodeGenerator.generate(
-                surname, name, birth_date, gender, municipality
-            )
-            
-            # Display result
+                code, error = None, str(e)
+        self._components[key] = (value, code, error)
+        return code, error
+    
+    def municipality_component(self, value):
+        """
+        Return (code, error) for the municipality, or (None, None) while a
+        name lookup is running in the background.
+        """
+        cached = self._components.get('municipality')
+        if cached is not None and cached[0] == value:
+            return cached[1], cached[2]
+        if not value:
+            return self.component('municipality', value, None)
+        if is_municipality_code(value.upper()):
+            return self.component('municipality', value, str.upper)
+        
+        if value != self._pending_lookup:
+            self._pending_lookup = value
+            future = self._lookups.submit(FiscalCodeGenerator.resolve_municipality, value)
+            self.root.after(LOOKUP_POLL_MS, self.poll_lookup, future, value)
+        return None, None
+    
+    def poll_lookup(self, future, value):
+        """Collect a finished municipality lookup on the UI thread."""
+        if not future.done():
+            self.root.after(LOOKUP_POLL_MS, self.poll_lookup, future, value)
+            return
+        if value == self._pending_lookup:
+            self._pending_lookup = None
+        if value != self.municipality_var.get().strip():
+            return  # The field changed meanwhile; a newer lookup is on its way
+        try:
+            code, error = future.result(), None
+        except ValueError as e:
+            code, error = None, str(e)
+        except Exception as e:
+            # A missing or malformed registry file; callbacks must not raise
+            code, error = None, f"Municipality registry unavailable ({e})"
+        self._components['municipality'] = (value, code, error)
+        explicit, self._generate_pending = self._generate_pending, False
+        error = self.update_live(explicit)
+        if explicit and error is not None:
+            messagebox.showerror("Error", error)
+    
+    def show_status(self, label, code, error, explicit=False):
+        """
+        Show a component's code, its error, or a pending marker. Empty
+        fields are only flagged on an explicit request.
+        """
+        if error == REQUIRED and not explicit:
+            label.config(text="")
+        elif error is not None:
+            label.config(text=f"✗ {error}", foreground=ERROR_COLOR)
+        elif code is not None:
+            label.config(text=f"✓ {code}", foreground=VALID_COLOR)
+        else:
+            label.config(text="…", foreground=PENDING_COLOR)
+    
+    def update_live(self, explicit=False):
+        """
+        Recompute the fiscal code from the current inputs.
+        
+        Unchanged components are reused, so editing the date does not
+        re-encode the names. The code is shown once every component is
+        valid; otherwise the field labels say what is wrong.
+        
+        Args:
+            explicit: True when the user asked for the code, so empty
+                fields are flagged too
+        
+        Returns:
+            The first field error, if any
+        """
+        self._pending_update = None
+        surname = self.surname_var.get().strip()
+        name = self.name_var.get().strip()
+        date_str = self.date_var.get().strip()
+        gender = self.gender_var.get()
+        
+        components = (
+            ("Surname", self.surname_status,
+             self.component('surname', surname, FiscalCodeGenerator.get_surname_code)),
+            ("First name", self.name_status,
+             self.component('name', name, FiscalCodeGenerator.get_name_code)),
+            ("Date of birth", self.date_status, self.component(
+                'birth_date', (date_str, gender),
+                lambda value: FiscalCodeGenerator.get_birth_date_code(parse_date(value[0]), value[1])
+            )),
+            ("Municipality", self.municipality_status,
+             self.municipality_component(self.municipality_var.get().strip())),
+        )
+        for _, label, (code, error) in components:
+            self.show_status(label, code, error, explicit)
+        
+        codes = [code for _, _, (code, _) in components]
+        errors = [f"{field}: {error}" for field, _, (_, error) in components if error is not None]
+        if None in codes:
+            self.show_result(None)
+            return errors[0] if errors else None
+        
+        code = ''.join(codes)
+        self.show_result(FiscalCode(code + FiscalCodeGenerator.calculate_check_digit(code)))
+        return None
+    
+    def show_result(self, fiscal_code):
+        """Display a fiscal code and its breakdown, or clear them."""
+        if fiscal_code is None:
+            self.fiscal_code_label.config(text="")
+            self.copy_button.config(state=tk.DISABLED)
+            breakdown = ""
+        else:
             self.fiscal_code_label.config(text=f"✓ {fiscal_code}")
             self.copy_button.config(state=tk.NORMAL)
-            
-            # Display breakdown
-            breakdown = (
-                f"Surname Code:       {fiscal_code[0:3]}\n"
-                f"Name Code:          {fiscal_code[3:6]}\n"
-                f"Year of Birth:      {fiscal_code[6:8]}\n"
-                f"Month:              {fiscal_code[8]}\n"
-                f"Day (+ 40 if F):    {fiscal_code[9:11]}\n"
-                f"Municipality:       {fiscal_code[11:15]}\n"
-                f"Check Digit:        {fiscal_code[15]}"
-            )
-            
-            self.breakdown_text.config(state=tk.NORMAL)
-            self.breakdown_text.delete(1.0, tk.END)
-            self.breakdown_text.insert(1.0, breakdown)
-            self.breakdown_text.config(state=tk.DISABLED)
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            breakdown = fiscal_code.describe()
+        
+        self.breakdown_text.config(state=tk.NORMAL)
+        self.breakdown_text.delete(1.0, tk.END)
+        self.breakdown_text.insert(1.0, breakdown)
+        self.breakdown_text.config(state=tk.DISABLED)
+    
+    def generate_code(self):
+        """Recompute right away, reporting the first invalid field."""
+        if self._pending_update is not None:
+            self.root.after_cancel(self._pending_update)
+        error = self.update_live(explicit=True)
+        if error is not None:
+            messagebox.showerror("Error", error)
+        elif self._pending_lookup is not None:
+            # The municipality is still being looked up; poll_lookup
+            # finishes the request
+            self._generate_pending = True
     
     def copy_to_clipboard(self):
         """Copy the fiscal code to clipboard."""
@@ -251,14 +390,21 @@ class FiscalCodeGUI:
         self.gender_var.set("M")
         self.municipality_var.set("")
         
-        # Clear result display
-        self.fiscal_code_label.config(text="")
-        self.copy_button.config(state=tk.DISABLED)
-        
-        # Clear breakdown
-        self.breakdown_text.config(state=tk.NORMAL)
-        self.breakdown_text.delete(1.0, tk.END)
-        self.breakdown_text.config(state=tk.DISABLED)
+        # Clear result display and field status
+        if self._pending_update is not None:
+            self.root.after_cancel(self._pending_update)
+            self._pending_update = None
+        self._components.clear()
+        self._pending_lookup = None
+        self._generate_pending = False
+        self.show_result(None)
+        for label in (self.surname_status, self.name_status, self.date_status, self.municipality_status):
+            label.config(text="")
+    
+    def close(self):
+        """Stop the lookup thread and close the window."""
+        self._lookups.shutdown(wait=False)
+        self.root.destroy()
 
 
 def main():
@@ -0,0 +1,189 @@
+"""
+Italian Fiscal Code - Metrics
+Minimal counters and histograms rendered in the Prometheus text format.
+
+Values are kept in a few independent stripes, each with its own lock.
+Every thread is pinned to one stripe, so concurrent workers rarely wait
+on each other; a scrape sums the stripes.
+"""
+
+import itertools
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+
+STRIPES = 16
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+
+_next_stripe = itertools.count()
+_local = threading.local()
+
+
+def _stripe_index() -> int:
+    """Stripe assigned to the calling thread, round-robin on first use."""
+    try:
+        return _local.stripe
+    except AttributeError:
+        _local.stripe = next(_next_stripe) % STRIPES
+        return _local.stripe
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    """Sample value as Prometheus expects it: integers exact, floats at full precision."""
+    if isinstance(value, int):
+        return str(value)
+    if value == float('inf'):
+        return '+Inf'
+    if value == float('-inf'):
+        return '-Inf'
+    if value != value:
+        return 'NaN'
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    """Shared plumbing: name, help text, label names and striped storage."""
+
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._stripes = [({}, threading.Lock()) for _ in range(STRIPES)]
+
+    def _check_labels(self, labelvalues: Tuple) -> Tuple:
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return labelvalues
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Sample lines of every series, in the Prometheus text format."""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic counter with optional labels."""
+
+    kind = 'counter'
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        """Add amount to the series identified by the label values."""
+        key = self._check_labels(labelvalues)
+        values, lock = self._stripes[_stripe_index()]
+        with lock:
+            values[key] = values.get(key, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        """Current total of one series."""
+        key = self._check_labels(labelvalues)
+        total = 0
+        for values, lock in self._stripes:
+            with lock:
+                total += values.get(key, 0)
+        return total
+
+    def _samples(self) -> List[str]:
+        totals: Dict[Tuple, float] = {}
+        for values, lock in self._stripes:
+            with lock:
+                for key, value in values.items():
+                    totals[key] = totals.get(key, 0) + value
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(totals.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Histogram with fixed upper bounds, plus sum and count."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labelvalues: str):
+        """Record one observation in the series identified by the label values."""
+        key = self._check_labels(labelvalues)
+        # Per-bucket (not cumulative) counts, then the +Inf bucket, then sum
+        slot = bisect_left(self.buckets, value)
+        values, lock = self._stripes[_stripe_index()]
+        with lock:
+            series = values.get(key)
+            if series is None:
+                series = values[key] = [0] * (len(self.buckets) + 2)
+            series[slot] += 1
+            series[-1] += value
+
+    def _samples(self) -> List[str]:
+        totals: Dict[Tuple, List[float]] = {}
+        for values, lock in self._stripes:
+            with lock:
+                for key, series in values.items():
+                    merged = totals.setdefault(key, [0] * len(series))
+                    for i, value in enumerate(series):
+                        merged[i] += value
+
+        lines = []
+        for key, series in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        """Create and register a histogram."""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
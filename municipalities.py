@@ -0,0 +1,184 @@
+"""
+Italian Fiscal Code - Municipality Registry
+Maps cadastral (Belfiore) codes to municipality and foreign country names
+and back.
+
+The bundled data/municipalities.csv covers provincial capitals and the most
+common foreign countries. Point FISCALCODE_MUNICIPALITIES at a CSV with the
+same columns (code,name,province) to load the complete official list.
+"""
+
+import csv
+import os
+import re
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'municipalities.csv')
+
+# Province abbreviation used for foreign countries
+FOREIGN_PROVINCE = 'EE'
+
+# A letter followed by three digits, e.g. H501
+_CODE_PATTERN = re.compile(r'[A-Z][0-9]{3}')
+
+# "Name (PR)" form used to disambiguate homonyms
+_NAME_WITH_PROVINCE = re.compile(r'(.+?)\s*\(([A-Za-z]{2})\)\s*$')
+
+_NOT_ALNUM = re.compile(r'[^A-Z0-9]+')
+
+
+class Municipality(NamedTuple):
+    """One registry entry."""
+    code: str
+    name: str
+    province: str
+
+
+def normalize_name(name: str) -> str:
+    """Fold a place name for lookups: no accents, upper case, single spaces."""
+    folded = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return _NOT_ALNUM.sub(' ', folded.upper()).strip()
+
+
+def is_municipality_code(value: str) -> bool:
+    """Check whether value has the shape of a cadastral code (e.g. 'H501')."""
+    return len(value) == 4 and _CODE_PATTERN.match(value) is not None
+
+
+def _slot(code: str) -> int:
+    """Position of a cadastral code in the direct-address table."""
+    return (ord(code[0]) - 65) * 1000 + int(code[1:])
+
+
+class MunicipalityRegistry:
+    """
+    Compact, read-only index of municipalities.
+
+    Entries live in three parallel tuples of interned strings. Code lookup
+    goes through a direct-address array over the 26,000 possible codes
+    (O(1)); name lookup bisects a sorted tuple of normalized names
+    (O(log n)).
+    """
+
+    __slots__ = ('_codes', '_names', '_provinces', '_slots', '_keys', '_rows')
+
+    def __init__(self, entries: Iterable[Tuple[str, str, str]]):
+        rows = sorted(
+            (code.strip().upper(), name.strip(), province.strip().upper())
+            for code, name, province in entries
+        )
+        for code, _, _ in rows:
+            if not is_municipality_code(code):
+                raise ValueError(f"Invalid municipality code '{code}'")
+
+        intern = sys.intern
+        self._codes = tuple(intern(code) for code, _, _ in rows)
+        self._names = tuple(intern(name) for _, name, _ in rows)
+        self._provinces = tuple(intern(province) for _, _, province in rows)
+
+        # Row number + 1 for every possible code, 0 when unknown
+        self._slots = array('I', bytes(4 * 26000))
+        for row, code in enumerate(self._codes):
+            self._slots[_slot(code)] = row + 1
+
+        by_name = sorted((normalize_name(name), row) for row, name in enumerate(self._names))
+        self._keys = tuple(key for key, _ in by_name)
+        self._rows = array('I', (row for _, row in by_name))
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'MunicipalityRegistry':
+        """Load a registry from a CSV file with code,name,province columns."""
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            return cls((row['code'], row['name'], row['province']) for row in reader)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def _entry(self, row: int) -> Municipality:
+        return Municipality(self._codes[row], self._names[row], self._provinces[row])
+
+    def get(self, code: str) -> Optional[Municipality]:
+        """Look up a municipality by cadastral code."""
+        code = code.upper()
+        if not is_municipality_code(code):
+            return None
+        row = self._slots[_slot(code)]
+        return self._entry(row - 1) if row else None
+
+    def find(self, name: str, province: Optional[str] = None) -> List[Municipality]:
+        """Find every municipality with the given name, optionally in one province."""
+        key = normalize_name(name)
+        keys = self._keys
+        matches = []
+        i = bisect_left(keys, key)
+        while i < len(keys) and keys[i] == key:
+            entry = self._entry(self._rows[i])
+            if province is None or entry.province == province.upper():
+                matches.append(entry)
+            i += 1
+        return matches
+
+    def search(self, prefix: str, limit: int = 10) -> List[Municipality]:
+        """
+        Return up to limit municipalities whose name starts with prefix.
+
+        Matching uses normalized names, so case and accents are ignored.
+        Results are in alphabetical order. Costs O(log n + limit).
+        """
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        keys = self._keys
+        matches = []
+        i = bisect_left(keys, key)
+        while i < len(keys) and len(matches) < limit and keys[i].startswith(key):
+            matches.append(self._entry(self._rows[i]))
+            i += 1
+        return matches
+
+    def resolve(self, value: str) -> str:
+        """
+        Turn a cadastral code or a municipality name into a cadastral code.
+
+        Values shaped like a code are returned as they are, even when the
+        registry does not list them. Names may carry the province as
+        "Name (PR)" to pick between homonyms.
+
+        Raises:
+            ValueError: If the name is unknown or ambiguous
+        """
+        value = value.strip()
+        if is_municipality_code(value.upper()):
+            return value.upper()
+
+        province = None
+        match = _NAME_WITH_PROVINCE.match(value)
+        if match:
+            value, province = match.groups()
+
+        matches = self.find(value, province)
+        if not matches:
+            raise ValueError(f"Unknown municipality '{value}'")
+        if len(matches) > 1:
+            options = ', '.join(f"{m.name} ({m.province})" for m in matches)
+            raise ValueError(f"Ambiguous municipality '{value}': {options}")
+        return matches[0].code
+
+
+_registry: Optional[MunicipalityRegistry] = None
+
+
+def get_registry() -> MunicipalityRegistry:
+    """Return the shared registry, loading it on first use."""
+    global _registry
+    if _registry is None:
+        _registry = MunicipalityRegistry.from_csv(
+            os.environ.get('FISCALCODE_MUNICIPALITIES', DEFAULT_DATA_PATH)
+        )
+    return _registry
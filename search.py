@@ -0,0 +1,347 @@
+"""
+Italian Fiscal Code - Reverse Search
+Find stored fiscal codes matching a partially masked code.
+
+Codes are streamed from a file (or any iterable) and stored packed, one
+64-bit integer per row (see fiscalcode.pack_code), plus one byte per row
+recording which digits omocodia replaced with letters. Four inverted indexes
+map each component - surname triplet, name triplet, birth date with
+gender, municipality - to the rows holding it, as array('I') row lists.
+A query such as RSS?RA80A01H50?? expands each partially known component
+into the values it allows, starts from the component with the fewest
+candidate rows and intersects or checks the others, so it never scans the
+whole table.
+
+Usage:
+    python search.py codes.txt 'RSS?RA80A01H50??'
+    python search.py customers.csv 'RSSMRA80A01????' --column fiscal_code
+"""
+
+import argparse
+import csv
+import sys
+import time
+from array import array
+from itertools import chain, product
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from fiscalcode import FiscalCodeGenerator, pack_code, unpack_code
+
+
+WILDCARD = '?'
+
+LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+DIGITS = '0123456789'
+
+# Sizes of the mixed-radix fields of a packed code (see pack_code)
+_MUNICIPALITY_RADIX = 26000
+_DATE_RADIX = 100 * 12 * 62
+_TRIPLET_RADIX = 26 ** 3
+
+# Positions holding digits, which omocodia may replace with letters
+_DIGIT_POSITIONS = FiscalCodeGenerator.OMOCODE_POSITIONS
+
+# Marks rows whose code could not be indexed
+_MISSING = 2 ** 64 - 1
+
+
+def _substitution_mask(code: str) -> int:
+    """Bit i set when _DIGIT_POSITIONS[i] of code holds an omocodia letter."""
+    letters = FiscalCodeGenerator.OMOCODE_LETTERS
+    mask = 0
+    for i, position in enumerate(_DIGIT_POSITIONS):
+        if code[position] in letters:
+            mask |= 1 << i
+    return mask
+
+
+def _substitute(code: str, mask: int) -> str:
+    """Rebuild an omocodic code from its base code and substitution mask."""
+    letters = FiscalCodeGenerator.OMOCODE_LETTERS
+    chars = list(code[:15])
+    for i, position in enumerate(_DIGIT_POSITIONS):
+        if mask >> i & 1:
+            chars[position] = letters[int(chars[position])]
+    body = ''.join(chars)
+    return body + FiscalCodeGenerator.calculate_check_digit(body)
+
+
+class SearchMatch(NamedTuple):
+    """One stored code matching a query."""
+    row: int
+    fiscal_code: str
+
+
+def _components(value: int) -> Tuple[int, int, int, int]:
+    """Surname, name, date and municipality component numbers of a packed code."""
+    value, municipality = divmod(value, _MUNICIPALITY_RADIX)
+    letters, date = divmod(value, _DATE_RADIX)
+    surname, name = divmod(letters, _TRIPLET_RADIX)
+    return surname, name, date, municipality
+
+
+def _options(char: str, allowed: str, position: int) -> str:
+    """Characters a query position accepts."""
+    if char == WILDCARD:
+        return allowed
+    if char not in allowed:
+        raise ValueError(f"Invalid character '{char}' at position {position + 1}")
+    return char
+
+
+def _digit_options(char: str, position: int) -> str:
+    """Digits a query digit position accepts; omocodia letters count as their digit."""
+    if char in FiscalCodeGenerator.OMOCODE_LETTERS:
+        char = str(FiscalCodeGenerator.DIGIT_VALUES[char])
+    return _options(char, DIGITS, position)
+
+
+def _triplet_values(pattern: str, offset: int) -> Optional[Set[int]]:
+    """Triplet numbers matching pattern[offset:offset + 3]; None if unconstrained."""
+    chars = pattern[offset:offset + 3]
+    if chars == WILDCARD * 3:
+        return None
+    options = [_options(char, LETTERS, offset + i) for i, char in enumerate(chars)]
+    return {
+        (ord(a) - 65) * 676 + (ord(b) - 65) * 26 + ord(c) - 65
+        for a, b, c in product(*options)
+    }
+
+
+def _date_values(pattern: str) -> Optional[Set[int]]:
+    """Date component numbers matching pattern[6:11]; None if unconstrained."""
+    chars = pattern[6:11]
+    if chars == WILDCARD * 5:
+        return None
+    year_tens = _digit_options(chars[0], 6)
+    year_units = _digit_options(chars[1], 7)
+    months = _options(chars[2], ''.join(FiscalCodeGenerator.MONTH_NUMBERS), 8)
+    day_tens = _digit_options(chars[3], 9)
+    day_units = _digit_options(chars[4], 10)
+
+    values = set()
+    for y1, y2, month, d1, d2 in product(year_tens, year_units, months, day_tens, day_units):
+        day = int(d1 + d2)
+        if not (1 <= day <= 31 or 41 <= day <= 71):
+            continue
+        month_index = FiscalCodeGenerator.MONTH_NUMBERS[month] - 1
+        day_slot = day - 10 if day > 40 else day - 1
+        values.add((int(y1 + y2) * 12 + month_index) * 62 + day_slot)
+    return values
+
+
+def _municipality_values(pattern: str) -> Optional[Set[int]]:
+    """Municipality component numbers matching pattern[11:15]; None if unconstrained."""
+    chars = pattern[11:15]
+    if chars == WILDCARD * 4:
+        return None
+    letters = _options(chars[0], LETTERS, 11)
+    digits = [_digit_options(char, 12 + i) for i, char in enumerate(chars[1:])]
+    return {
+        (ord(letter) - 65) * 1000 + int(a + b + c)
+        for letter, a, b, c in product(letters, *digits)
+    }
+
+
+class FiscalCodeIndex:
+    """
+    Component index over a column of fiscal codes.
+
+    Rows are numbered in insertion order, counting rows that could not be
+    indexed, so a match's row number points back to the source line.
+    Omocodic codes are indexed by their base code and returned as stored.
+    """
+
+    __slots__ = ('_packed', '_substitutions', '_postings', 'skipped')
+
+    def __init__(self):
+        self._packed = array('Q')
+        # Per row, bit i set when _DIGIT_POSITIONS[i] holds an omocodia letter
+        self._substitutions = bytearray()
+        # One dict per component: component number -> sorted row numbers
+        self._postings: Tuple[Dict[int, array], ...] = ({}, {}, {}, {})
+        self.skipped = 0
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[str]) -> 'FiscalCodeIndex':
+        """Build an index from an iterable of codes, one row each."""
+        index = cls()
+        index.update(codes)
+        return index
+
+    @classmethod
+    def from_file(cls, path: str, column: Optional[str] = None) -> 'FiscalCodeIndex':
+        """
+        Build an index from a file, streaming it line by line.
+
+        Args:
+            path: Text file with one code per line, or a CSV file
+            column: CSV column holding the codes; without it every line
+                is read as a bare code
+        """
+        with open(path, newline='', encoding='utf-8') as f:
+            if column is None:
+                return cls.from_codes(line.strip() for line in f)
+            reader = csv.DictReader(f)
+            if column not in (reader.fieldnames or ()):
+                raise ValueError(f"CSV header has no '{column}' column")
+            return cls.from_codes(row[column] or '' for row in reader)
+
+    def update(self, codes: Iterable[str]):
+        """Append codes as new rows; invalid ones are counted in skipped."""
+        packed = self._packed
+        substitutions = self._substitutions
+        postings = self._postings
+        validate = FiscalCodeGenerator.validate
+        normalize = FiscalCodeGenerator.normalize_omocode
+        row = len(packed)
+        for code in codes:
+            code = code.strip().upper()
+            try:
+                value = pack_code(code)
+                mask = 0
+            except ValueError:
+                # Either invalid or omocodic; the latter packs as its base code
+                if not validate(code):
+                    packed.append(_MISSING)
+                    substitutions.append(0)
+                    self.skipped += 1
+                    row += 1
+                    continue
+                value = pack_code(normalize(code))
+                mask = _substitution_mask(code)
+            packed.append(value)
+            substitutions.append(mask)
+            for index, component in zip(postings, _components(value)):
+                rows = index.get(component)
+                if rows is None:
+                    rows = index[component] = array('I')
+                rows.append(row)
+            row += 1
+
+    def __len__(self) -> int:
+        return len(self._packed)
+
+    def _row_lists(self, component: int, values: Set[int]) -> List[array]:
+        """Row lists of the given values in one component index."""
+        index = self._postings[component]
+        return [index[value] for value in values if value in index]
+
+    def search(self, pattern: str, limit: Optional[int] = None) -> List[SearchMatch]:
+        """
+        Find stored codes matching a masked code.
+
+        Args:
+            pattern: 15 or 16 characters, '?' for each unknown one (case
+                insensitive); without the 16th character the check digit
+                is not compared. At least one surname, name, date or
+                municipality character must be known. Omocodia letters
+                in digit positions match their digit, so a pattern finds
+                the base code and all its omocodic variants; a known 16th
+                character is compared with each code as stored.
+            limit: Stop after this many matches
+
+        Returns:
+            Matches in row order, each with the code as stored
+
+        Raises:
+            ValueError: If the pattern is malformed or fixes no component
+        """
+        pattern = pattern.strip().upper()
+        if len(pattern) not in (15, 16):
+            raise ValueError("Pattern must have 15 or 16 characters")
+        check_digit = None
+        if len(pattern) == 16 and pattern[15] != WILDCARD:
+            check_digit = _options(pattern[15], LETTERS, 15)
+
+        allowed = (
+            _triplet_values(pattern, 0),
+            _triplet_values(pattern, 3),
+            _date_values(pattern),
+            _municipality_values(pattern),
+        )
+        constrained = [i for i, values in enumerate(allowed) if values is not None]
+        if not constrained:
+            raise ValueError("Pattern must fix at least one surname, name, date or municipality character")
+
+        # Start from the component with the fewest candidate rows, then
+        # intersect with the other components whose row lists are not much
+        # longer (set operations run in C); the remaining ones are checked
+        # on the packed values of the survivors
+        lists = {i: self._row_lists(i, allowed[i]) for i in constrained}
+        sizes = {i: sum(len(rows) for rows in lists[i]) for i in constrained}
+        constrained.sort(key=sizes.get)
+        first = lists[constrained[0]]
+        rows = first[0] if len(first) == 1 else sorted(chain.from_iterable(first))
+        checks = []
+        for i in constrained[1:]:
+            if sizes[i] > 8 * len(rows):
+                checks.append((i, allowed[i]))
+                continue
+            keep = set()
+            for other in lists[i]:
+                keep.update(other)
+            rows = [row for row in rows if row in keep]
+
+        packed = self._packed
+        substitutions = self._substitutions
+        matches = []
+        for row in rows:
+            value = packed[row]
+            if checks:
+                components = _components(value)
+                if any(components[i] not in values for i, values in checks):
+                    continue
+            code = unpack_code(value)
+            mask = substitutions[row]
+            if mask:
+                code = _substitute(code, mask)
+            if check_digit is not None and code[15] != check_digit:
+                continue
+            matches.append(SearchMatch(row, code))
+            if limit is not None and len(matches) >= limit:
+                break
+        return matches
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Find fiscal codes matching a masked code.")
+    parser.add_argument('path', help="File with one code per line, or a CSV file with --column")
+    parser.add_argument('patterns', nargs='+', help="Masked codes, '?' for unknown characters")
+    parser.add_argument('--column', help="CSV column holding the codes")
+    parser.add_argument('--limit', type=int, default=100, help="Matches shown per pattern (default: 100)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Index the file once, then answer every pattern."""
+    args = parse_args(argv)
+    start = time.perf_counter()
+    try:
+        index = FiscalCodeIndex.from_file(args.path, args.column)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    print(
+        f"Indexed {len(index) - index.skipped} codes ({index.skipped} invalid rows skipped) "
+        f"in {time.perf_counter() - start:.2f}s",
+        file=sys.stderr
+    )
+
+    for pattern in args.patterns:
+        start = time.perf_counter()
+        try:
+            matches = index.search(pattern, args.limit)
+        except ValueError as e:
+            print(f"❌ {pattern}: {e}", file=sys.stderr)
+            return 1
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{pattern}: {len(matches)} matches in {elapsed:.2f} ms", file=sys.stderr)
+        for match in matches:
+            print(f"{match.row}\t{match.fiscal_code}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -159,6 +159,49 @@ dateInput.addEventListener('blur', (e) => {
     }
 });
 
+// Municipality autocomplete
+const municipalityInput = document.getElementById('municipality');
+const municipalityList = document.getElementById('municipalityList');
+let suggestTimer = null;
+
+municipalityInput.addEventListener('input', (e) => {
+    clearTimeout(suggestTimer);
+    const prefix = e.target.value.trim();
+    
+    // Codes (e.g. H501) need no suggestions
+    if (prefix.length < 2 || /^[A-Za-z]\d/.test(prefix)) {
+        municipalityList.innerHTML = '';
+        return;
+    }
+    
+    suggestTimer = setTimeout(() => loadSuggestions(prefix), 150);
+});
+
+/**
+ * Fill the municipality datalist with names starting with prefix
+ */
+async function loadSuggestions(prefix) {
+    try {
+        const response = await fetch('/api/municipalities?q=' + encodeURIComponent(prefix.toLowerCase()));
+        const matches = await response.json();
+        
+        // A slower reply for an older prefix must not replace newer results
+        if (municipalityInput.value.trim() !== prefix) {
+            return;
+        }
+        
+        municipalityList.innerHTML = '';
+        matches.forEach(m => {
+            const option = document.createElement('option');
+            option.value = `${m.name} (${m.province})`;
+            option.label = m.code;
+            municipalityList.appendChild(option);
+        });
+    } catch (err) {
+        console.error('Failed to load suggestions:', err);
+    }
+}
+
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', () => {
     // Add some nice animations
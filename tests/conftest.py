@@ -0,0 +1,21 @@
+import os
+import sys
+from datetime import date
+
+# The modules live at the repository root, next to this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fiscalcode import FiscalCodeGenerator
+
+
+def generate(surname='Rossi', name='Mario', birth_date=date(1980, 1, 1), gender='M', municipality='H501'):
+    return FiscalCodeGenerator.generate(surname, name, birth_date, gender, municipality)
+
+
+SAMPLE_CODES = [
+    generate(),
+    generate('Bianchi', 'Maria', date(1985, 3, 31), 'F', 'F205'),
+    generate('Fo', 'Li', date(2000, 2, 29), 'F', 'Z110'),
+    generate('Verdi', 'Giuseppe', date(1999, 12, 1), 'M', 'A001'),
+    generate('Zanetti', 'Anna', date(1971, 7, 11), 'F', 'Z999'),
+]
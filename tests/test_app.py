@@ -0,0 +1,207 @@
+"""Input validation of the Flask API."""
+
+import time
+
+import pytest
+
+pytest.importorskip('flask')
+
+from app import VALIDATION_ERRORS, app
+from fiscalcode import BatchResult, FiscalCodeGenerator
+
+
+VALID = {
+    'surname': 'Rossi',
+    'name': 'Mario',
+    'birthDate': '01/01/1980',
+    'gender': 'M',
+    'municipality': 'H501',
+}
+
+
+@pytest.fixture
+def client():
+    app.config['RESPONSE_CACHE_SIZE'] = 0
+    return app.test_client()
+
+
+def rejected(client, reason, **kwargs):
+    """POST to /api/generate, expecting a 400 counted under reason."""
+    before = VALIDATION_ERRORS.value(reason)
+    response = client.post('/api/generate', **kwargs)
+    assert response.status_code == 400
+    assert VALIDATION_ERRORS.value(reason) == before + 1
+    return response.get_json()['error']
+
+
+def test_generate(client):
+    response = client.post('/api/generate', json=VALID)
+    assert response.status_code == 200
+    assert response.get_json()['fiscalCode'] == 'RSSMRA80A01H501U'
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'data': 'surname=Rossi', 'content_type': 'application/x-www-form-urlencoded'},
+    {'data': '{not json', 'content_type': 'application/json'},
+    {'json': [VALID]},
+])
+def test_generate_rejects_non_object_body(client, kwargs):
+    assert rejected(client, 'invalid_json', **kwargs) == 'Body must be a JSON object'
+
+
+def test_generate_coerces_null_fields(client):
+    response = client.post('/api/generate', json=dict(VALID, gender=None))
+    assert response.status_code == 200
+    error = rejected(client, 'missing_name', json=dict(VALID, name=None))
+    assert error == 'Surname and name are required'
+
+
+@pytest.mark.parametrize('field, value, reason', [
+    ('gender', 'X', 'invalid_gender'),
+    ('birthDate', '31/02/1980', 'invalid_birth_date'),
+    # The message quotes the input; the reason must not depend on it
+    ('municipality', 'Date Gender Surname', 'invalid_municipality'),
+])
+def test_generate_error_reason(client, field, value, reason):
+    rejected(client, reason, json=dict(VALID, **{field: value}))
+
+
+def test_batch_error_reasons(client):
+    before = VALIDATION_ERRORS.value('invalid_json'), VALIDATION_ERRORS.value('invalid_municipality')
+    body = '\n'.join([
+        '{"surname": "Rossi", "name": "Mario", "birthDate": "01/01/1980", "municipality": "Nowhere JSON"}',
+        '{broken',
+        '[]',
+    ])
+    response = client.post('/api/generate/batch', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 200
+    assert len(response.get_data(as_text=True).splitlines()) == 3
+    after = VALIDATION_ERRORS.value('invalid_json'), VALIDATION_ERRORS.value('invalid_municipality')
+    assert after == (before[0] + 2, before[1] + 1)
+
+
+def test_generate_is_post_only(client):
+    assert client.get('/api/generate', query_string=VALID).status_code == 405
+
+
+def test_generate_post_ignores_if_none_match(client):
+    etag = client.post('/api/generate', json=VALID).headers['ETag']
+    response = client.post('/api/generate', json=VALID, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] == etag
+    assert response.get_json()['fiscalCode'] == 'RSSMRA80A01H501U'
+
+
+def test_generate_response_cache(monkeypatch):
+    import app as app_module
+    from app import RESPONSE_CACHE_LOOKUPS
+
+    monkeypatch.setitem(app.config, 'RESPONSE_CACHE_SIZE', 16)
+    monkeypatch.setattr(app_module, '_response_cache', None)
+    client = app.test_client()
+    first = client.post('/api/generate', json=VALID)
+    hits = RESPONSE_CACHE_LOOKUPS.value('hit')
+    second = client.post('/api/generate', json=dict(VALID, surname='ROSSI', name='mario', municipality='h501'))
+    assert RESPONSE_CACHE_LOOKUPS.value('hit') == hits + 1
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert second.get_data() == first.get_data()
+    for birth_date in ('1/1/1980', '1980-01-01'):
+        response = client.post('/api/generate', json=dict(VALID, birthDate=birth_date))
+        assert response.headers['ETag'] == first.headers['ETag']
+    assert RESPONSE_CACHE_LOOKUPS.value('hit') == hits + 3
+
+
+def test_demo_honours_if_none_match(client):
+    etag = client.get('/api/demo').headers['ETag']
+    response = client.get('/api/demo', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.get_data() == b''
+
+
+def request_latency(client, endpoint='/api/generate/batch'):
+    """(count, sum) of an endpoint's latency histogram."""
+    samples = {}
+    for line in client.get('/metrics').get_data(as_text=True).splitlines():
+        if line.startswith('fiscalcode_http_request_duration_seconds_') and f'"{endpoint}"}}' in line:
+            name, value = line.split(' ')
+            samples[name.split('{')[0].rsplit('_', 1)[1]] = float(value)
+    return samples.get('count', 0), samples.get('sum', 0.0)
+
+
+def test_batch_latency_covers_the_streamed_body(client, monkeypatch):
+    def slow_many(records):
+        for index, _ in enumerate(records):
+            time.sleep(0.05)
+            yield BatchResult(index, 'RSSMRA80A01H501U', None)
+
+    monkeypatch.setattr(FiscalCodeGenerator, 'generate_many', slow_many)
+    count, total = request_latency(client)
+    response = client.post('/api/generate/batch', json=[VALID, VALID])
+    assert len(response.get_data(as_text=True).splitlines()) == 2
+    after_count, after_total = request_latency(client)
+    assert after_count == count + 1
+    assert after_total - total >= 0.1
+
+
+def test_static_files_are_timed(client):
+    endpoint = '/static/<path:filename>'
+    count, _ = request_latency(client, endpoint)
+    response = client.get('/static/style.css')
+    assert response.status_code == 200
+    response.close()
+    assert request_latency(client, endpoint)[0] == count + 1
+
+
+@pytest.fixture
+def coalescing_client(client, monkeypatch):
+    import app as app_module
+
+    monkeypatch.setitem(app.config, 'COALESCE_MAX_BATCH', 8)
+    monkeypatch.setitem(app.config, 'COALESCE_MAX_WAIT_MS', 50)
+    monkeypatch.setattr(app_module, '_coalescer', None)
+    yield client
+    if app_module._coalescer is not None:
+        app_module._coalescer.close()
+
+
+def test_generate_coalesced(coalescing_client):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app import COALESCED_BATCH_SIZES, get_coalescer
+
+    payloads = [dict(VALID, surname=surname) for surname in ('Rossi', 'Bianchi', 'Verdi', 'Neri')]
+    payloads.append(dict(VALID, gender='X'))
+
+    def post(payload):
+        response = app.test_client().post('/api/generate', json=payload)
+        return response.status_code, response.get_json()
+
+    with ThreadPoolExecutor(max_workers=len(payloads)) as pool:
+        coalescers = set(pool.map(lambda _: get_coalescer(), range(16)))
+        assert len(coalescers) == 1
+        before = COALESCED_BATCH_SIZES.render()
+        responses = list(pool.map(post, payloads))
+
+    assert [status for status, _ in responses] == [200] * 4 + [400]
+    assert [body['fiscalCode'][:3] for _, body in responses[:4]] == ['RSS', 'BNC', 'VRD', 'NRE']
+    assert responses[4][1]['error'] == "Gender must be 'M' or 'F'"
+    assert COALESCED_BATCH_SIZES.render() != before
+
+
+def test_profile_endpoint(client):
+    FiscalCodeGenerator.disable_profiling()
+    for method in (client.get, client.delete):
+        assert method('/api/profile').status_code == 404
+
+    FiscalCodeGenerator.enable_profiling()
+    try:
+        assert client.delete('/api/profile').status_code == 204
+        assert client.post('/api/generate', json=VALID).status_code == 200
+        stats = client.get('/api/profile').get_json()
+        text = client.get('/api/profile?format=text').get_data(as_text=True)
+    finally:
+        FiscalCodeGenerator.disable_profiling()
+    assert stats['validation']['calls'] == 1
+    assert stats['calculate_check_digit']['calls'] == 1
+    assert text.startswith('stage')
+    assert client.get('/api/profile').status_code == 404
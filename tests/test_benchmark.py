@@ -0,0 +1,30 @@
+import json
+
+from benchmark import BenchmarkResult, compare, main
+
+
+def result(name, ops_per_sec):
+    return BenchmarkResult(name, 100, ops_per_sec, 1.0, 2.0, 0.5)
+
+
+def test_compare_flags_drops_past_the_threshold(capsys):
+    baseline = {'results': {'slower': {'ops_per_sec': 1000}, 'steady': {'ops_per_sec': 1000}}}
+    results = [result('slower', 850), result('steady', 950), result('new', 10)]
+    assert compare(results, baseline, 0.10) == ['slower']
+    assert compare(results, baseline, 0.20) == []
+    assert 'new' in capsys.readouterr().out
+
+
+def test_exit_status_follows_the_baseline(tmp_path):
+    output = tmp_path / 'results.json'
+    args = ['--size', '20', '--repeat', '1', '--only', 'calculate_check_digit_bytes,generate_many']
+    assert main(args + ['-o', str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert set(report['results']) == {'calculate_check_digit_bytes', 'generate_many'}
+
+    baseline = tmp_path / 'baseline.json'
+    for factor, status in ((0.01, 0), (100, 1)):
+        scaled = {name: dict(r, ops_per_sec=r['ops_per_sec'] * factor) for name, r in report['results'].items()}
+        baseline.write_text(json.dumps({'results': scaled}))
+        assert main(args + ['--baseline', str(baseline)]) == status
+    assert main(['--size', '20', '--only', 'nonexistent']) == 2
@@ -0,0 +1,55 @@
+import pytest
+
+from fiscalcode import CacheStats, FiscalCodeGenerator, LRUCache
+
+
+@pytest.fixture
+def cached():
+    FiscalCodeGenerator.enable_cache(2)
+    yield FiscalCodeGenerator
+    FiscalCodeGenerator.disable_cache()
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the least recently used
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats() == CacheStats(hits=3, misses=1, evictions=1, size=2, capacity=2)
+
+
+def test_lru_rejects_empty_capacity():
+    with pytest.raises(ValueError):
+        LRUCache(0)
+    with pytest.raises(ValueError):
+        FiscalCodeGenerator.enable_cache(0)
+
+
+def test_hit_rate():
+    assert CacheStats(3, 1, 0, 2, 2).hit_rate == 0.75
+    assert CacheStats(0, 0, 0, 0, 2).hit_rate == 0.0
+
+
+def test_generator_caches_count_and_evict(cached):
+    for surname in ('Rossi', 'Rossi', 'Bianchi', 'Verdi', 'Rossi'):
+        cached.get_surname_code(surname)
+    stats = cached.cache_stats()['surname']
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 4, 2, 2)
+
+
+def test_clear_cache_keeps_caches_enabled(cached):
+    cached.get_surname_code('Rossi')
+    cached.get_surname_code('Rossi')
+    cached.clear_cache()
+    assert cached.cache_stats()['surname'] == CacheStats(0, 0, 0, 0, 2)
+    cached.get_surname_code('Rossi')
+    assert cached.cache_stats()['surname'].misses == 1
+
+
+def test_disable_cache():
+    FiscalCodeGenerator.enable_cache(4)
+    FiscalCodeGenerator.disable_cache()
+    assert FiscalCodeGenerator.cache_stats() == {}
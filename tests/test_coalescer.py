@@ -0,0 +1,100 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from coalescer import RequestCoalescer
+
+
+class Recorder:
+    """Stub batch handler: doubles each item and remembers the batches."""
+
+    def __init__(self, error=None):
+        self.batches = []
+        self.error = error
+        self.lock = threading.Lock()
+
+    def __call__(self, items):
+        with self.lock:
+            self.batches.append(list(items))
+        if self.error is not None:
+            raise self.error
+        return [item * 2 for item in items]
+
+
+def submit_all(coalescer, items):
+    """Submit every item from its own thread; results (or exceptions) in item order."""
+    def submit(item):
+        try:
+            return coalescer.submit(item, timeout=5)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=len(items)) as pool:
+        return list(pool.map(submit, items))
+
+
+def test_batches_up_to_max_batch_size():
+    handler = Recorder()
+    coalescer = RequestCoalescer(handler, max_batch_size=4, max_wait=0.5)
+    try:
+        assert submit_all(coalescer, list(range(10))) == [i * 2 for i in range(10)]
+    finally:
+        coalescer.close()
+    sizes = [len(batch) for batch in handler.batches]
+    assert sum(sizes) == 10
+    assert max(sizes) == 4
+    assert sorted(item for batch in handler.batches for item in batch) == list(range(10))
+
+
+def test_max_wait_cuts_a_batch_short():
+    handler = Recorder()
+    coalescer = RequestCoalescer(handler, max_batch_size=100, max_wait=0.05)
+    try:
+        start = time.monotonic()
+        assert coalescer.submit(21, timeout=5) == 42
+        assert time.monotonic() - start < 1
+    finally:
+        coalescer.close()
+    assert handler.batches == [[21]]
+
+
+def test_handler_exception_reaches_every_caller():
+    error = ValueError("boom")
+    coalescer = RequestCoalescer(Recorder(error), max_batch_size=3, max_wait=0.5)
+    try:
+        results = submit_all(coalescer, [1, 2, 3])
+    finally:
+        coalescer.close()
+    assert results == [error] * 3
+
+
+def test_wrong_number_of_results():
+    coalescer = RequestCoalescer(lambda items: [], max_batch_size=2, max_wait=0)
+    try:
+        with pytest.raises(RuntimeError, match='wrong number of results'):
+            coalescer.submit(1, timeout=5)
+    finally:
+        coalescer.close()
+
+
+def test_close_stops_the_worker_and_submit_restarts_it():
+    handler = Recorder()
+    coalescer = RequestCoalescer(handler, max_batch_size=8, max_wait=0)
+    assert coalescer.submit(1, timeout=5) == 2
+    worker = coalescer._worker
+    coalescer.close()
+    assert coalescer._worker is None
+    assert not worker.is_alive()
+    coalescer.close()  # Closing twice is harmless
+    try:
+        assert coalescer.submit(2, timeout=5) == 4
+    finally:
+        coalescer.close()
+
+
+@pytest.mark.parametrize('kwargs', [{'max_batch_size': 0}, {'max_wait': -1}])
+def test_invalid_settings(kwargs):
+    with pytest.raises(ValueError):
+        RequestCoalescer(Recorder(), **kwargs)
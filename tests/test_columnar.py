@@ -0,0 +1,96 @@
+from datetime import date, datetime
+
+import pytest
+
+from fiscalcode import FiscalCodeGenerator
+
+
+RECORDS = [
+    ('Rossi', 'Mario', date(1980, 1, 1), 'M', 'H501'),
+    ('Bianchi', 'Maria', date(1985, 3, 31), 'F', 'F205'),
+    ('Verdi', 'Giuseppe', None, 'M', 'A001'),
+    (None, 'Anna', date(1971, 7, 11), 'F', 'Z999'),
+]
+
+
+def expected_results():
+    return [(r.fiscal_code, r.error) for r in FiscalCodeGenerator.generate_many(RECORDS)]
+
+
+def test_generate_frame_missing_values_and_index():
+    pd = pytest.importorskip('pandas')
+    from columnar import generate_frame
+
+    frame = pd.DataFrame({
+        'cognome': [r[0] if r[0] is not None else float('nan') for r in RECORDS],
+        'name': [r[1] for r in RECORDS],
+        'birth_date': pd.to_datetime([r[2] for r in RECORDS]),  # None becomes NaT
+        'gender': [r[3] for r in RECORDS],
+        'municipality_code': [r[4] for r in RECORDS],
+    }, index=[10, 7, 'x', 3])
+    assert frame['birth_date'].isna().tolist() == [False, False, True, False]
+
+    result = generate_frame(frame, columns={'surname': 'cognome'}, chunk_size=3)
+    assert result.index.tolist() == [10, 7, 'x', 3]
+    assert list(zip(result['fiscal_code'], result['error'])) == expected_results()
+    assert result.loc[10, 'fiscal_code'] == 'RSSMRA80A01H501U'
+    assert result.loc['x', 'fiscal_code'] is None
+
+
+def test_generate_frame_rejects_unknown_fields():
+    pd = pytest.importorskip('pandas')
+    from columnar import generate_frame
+
+    with pytest.raises(ValueError, match='Unknown fields: birthday'):
+        generate_frame(pd.DataFrame(), columns={'birthday': 'dob'})
+
+
+def test_validate_series_missing_values():
+    pd = pytest.importorskip('pandas')
+    from columnar import validate_series
+
+    series = pd.Series(
+        ['RSSMRA80A01H501U', None, float('nan'), 'RSSMRA80A01H501A', 'BNCMRA85C71F205T'],
+        index=list('abcde'),
+    )
+    valid = validate_series(series, chunk_size=2)
+    assert valid.name == 'valid'
+    assert valid.index.tolist() == list('abcde')
+    assert valid.tolist() == [True, False, False, False, True]
+    assert validate_series(pd.Series([], dtype=object)).tolist() == []
+
+
+def test_generate_table_round_trip():
+    pa = pytest.importorskip('pyarrow')
+    from columnar import generate_table, validate_arrow
+
+    table = pa.table({
+        'surname': [r[0] for r in RECORDS],
+        'name': [r[1] for r in RECORDS],
+        'birth_date': pa.array([r[2] for r in RECORDS], type=pa.date32()),
+        'gender': [r[3] for r in RECORDS],
+        'municipality_code': [r[4] for r in RECORDS],
+    })
+    result = generate_table(table, chunk_size=3)
+    assert result.column_names == ['fiscal_code', 'error']
+    assert list(zip(result['fiscal_code'].to_pylist(), result['error'].to_pylist())) == expected_results()
+
+    valid = validate_arrow(result['fiscal_code'], chunk_size=3)
+    assert valid.num_chunks == 2
+    assert valid.to_pylist() == [True, True, False, False]
+
+
+def test_generate_table_timestamps_and_strings():
+    pa = pytest.importorskip('pyarrow')
+    from columnar import generate_table
+
+    table = pa.table({
+        'surname': ['Rossi', 'Rossi'],
+        'name': ['Mario', 'Mario'],
+        'birth_date': pa.array([datetime(1980, 1, 1, 12, 30), None], type=pa.timestamp('us')),
+        'gender': ['M', 'M'],
+        'municipality_code': ['H501', 'H501'],
+    })
+    assert generate_table(table)['fiscal_code'].to_pylist() == ['RSSMRA80A01H501U', None]
+    as_strings = table.set_column(2, 'birth_date', pa.array(['01/01/1980', '1980-01-01']))
+    assert generate_table(as_strings)['fiscal_code'].to_pylist() == ['RSSMRA80A01H501U'] * 2
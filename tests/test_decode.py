@@ -0,0 +1,40 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from conftest import generate
+from fiscalcode import FiscalCodeGenerator
+
+
+def test_decode_fields():
+    decoded = FiscalCodeGenerator.decode(generate('Bianchi', 'Maria', date(1985, 3, 31), 'F', 'F205'))
+    assert decoded.birth_date == datetime(1985, 3, 31)
+    assert decoded.gender == 'F'
+    assert decoded.municipality_code == 'F205'
+
+
+def test_decode_century_never_in_the_future():
+    today = date.today()
+    # Born today: current century
+    assert FiscalCodeGenerator.decode(generate(birth_date=today)).birth_date.date() == today
+    # Tomorrow 100 years ago: the same two-digit year would be in the future
+    tomorrow = today + timedelta(days=1)
+    try:
+        past = tomorrow.replace(year=tomorrow.year - 100)
+    except ValueError:  # 29 February
+        past = tomorrow.replace(year=tomorrow.year - 100, day=28)
+    assert FiscalCodeGenerator.decode(generate(birth_date=past)).birth_date.date() == past
+
+
+@pytest.mark.parametrize('code, message', [
+    ('RSSMRA80A01H501', 'must be 16 characters'),
+    ('RSSMRA8XA01H501U', 'Invalid fiscal code format'),
+    ('RSSMRA80Z01H501U', 'Invalid month letter'),
+    ('RSSMRA80B30H501U', 'Invalid day of birth'),
+    ('RSSMRA81B29H501R', 'Invalid day of birth'),   # 1981 is not a leap year
+    ('RSSMRA81B69H501V', 'Invalid day of birth'),
+    ('RSSMRA80A01H501A', 'Invalid check digit'),
+])
+def test_decode_errors(code, message):
+    with pytest.raises(ValueError, match=message):
+        FiscalCodeGenerator.decode(code)
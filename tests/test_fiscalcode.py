@@ -0,0 +1,246 @@
+import io
+from datetime import date
+
+import pytest
+
+from codeset import FiscalCodeSet
+from conftest import SAMPLE_CODES, generate
+from fiscalcode import FiscalCode, FiscalCodeGenerator, pack_code, unpack_code, write_results
+
+
+def test_generate_known_code():
+    assert generate() == 'RSSMRA80A01H501U'
+
+
+@pytest.mark.parametrize('surname, name', [
+    ('Rossi', 'Mario'),
+    ("d'Amico", 'Gianfranco'),
+    ('De Luca-Ré', 'Nicolò'),
+    ('Müller', 'Zoë'),
+    ('ﬁlippo', 'Ǉubica'),
+    ('ǆemal', 'Ĳsbrand'),
+    ('Fo', 'Li'),
+    ('', 'Mario'),
+])
+def test_generate_many_matches_generate(surname, name):
+    record = (surname, name, '01/01/1980', 'M', 'H501')
+    (result,) = FiscalCodeGenerator.generate_many([record])
+    try:
+        expected = generate(surname, name)
+    except ValueError as e:
+        assert result.error == str(e) and result.field == 'surname'
+    else:
+        assert result.fiscal_code == expected
+
+
+def test_fiscal_code_breakdown_and_describe():
+    code = FiscalCode('RSSMRA80A01H501U')
+    assert code.breakdown == ('RSS', 'MRA', '80', 'A', '01', 'H501', 'U')
+    assert code.breakdown.municipality == 'H501'
+    assert code.describe().splitlines() == [
+        'Surname Code:       RSS',
+        'Name Code:          MRA',
+        'Year of Birth:      80',
+        'Month:              A',
+        'Day (+ 40 if F):    01',
+        'Municipality:       H501',
+        'Check Digit:        U',
+    ]
+
+
+@pytest.mark.parametrize('code, gender, municipality', [
+    ('RSSMRA80A01H501U', 'M', 'H501'),
+    ('BNCMRA85C71F205T', 'F', 'F205'),
+    # Omocodic day digits: 'L' is 0 and 'T' is 7, so 'LM' is day 01 and 'TM' is 71
+    (list(FiscalCodeGenerator.omocode_variants('RSSMRA80A01H501U'))[-1], 'M', 'H501'),
+    ('BNCMRA85CTMF205X', 'F', 'F205'),
+    ('BNCMRA85CTMFNLRG', 'F', 'F205'),
+])
+def test_fiscal_code_gender_and_municipality(code, gender, municipality):
+    code = FiscalCode(code)
+    assert code.gender == gender
+    assert code.municipality_code == municipality
+
+
+def test_fiscal_code_parse():
+    code = FiscalCode.parse('  rssmra80a01h501u ')
+    assert type(code) is FiscalCode and code == 'RSSMRA80A01H501U'
+    assert code.birth_date.date() == date(1980, 1, 1)
+    with pytest.raises(ValueError, match='check'):
+        FiscalCode.parse('RSSMRA80A01H501A')
+    with pytest.raises(ValueError):
+        FiscalCode.parse('RSSMRA80')
+
+
+def test_fiscal_code_behaves_like_str():
+    code = FiscalCode('RSSMRA80A01H501U')
+    assert code == 'RSSMRA80A01H501U' and 'RSSMRA80A01H501U' == code
+    assert hash(code) == hash('RSSMRA80A01H501U')
+    assert {code: 1}['RSSMRA80A01H501U'] == 1
+    assert 'RSSMRA80A01H501U' in {code}
+    assert repr(code) == "FiscalCode('RSSMRA80A01H501U')"
+    assert not hasattr(code, '__dict__')
+
+
+@pytest.mark.parametrize('code', SAMPLE_CODES)
+def test_pack_unpack_round_trip(code):
+    value = pack_code(code)
+    assert 0 <= value < 2 ** 63
+    assert unpack_code(value) == code
+
+
+def test_pack_keeps_order_of_fields_distinct():
+    # Female days (41-71) must not collide with male days (1-31)
+    male = generate(birth_date=date(1980, 1, 11), gender='M')
+    female = generate(birth_date=date(1980, 1, 11), gender='F')
+    assert pack_code(male) != pack_code(female)
+    assert unpack_code(pack_code(female))[9:11] == '51'
+
+
+def test_pack_rejects_invalid_and_omocodic_codes():
+    with pytest.raises(ValueError):
+        pack_code('RSSMRA80A01H501A')
+    with pytest.raises(ValueError):
+        pack_code('RSSMRA80A01H50MM')
+
+
+def test_codeset_membership_and_merges():
+    omocode = list(FiscalCodeGenerator.omocode_variants(SAMPLE_CODES[0]))[3]
+    left = FiscalCodeSet(SAMPLE_CODES[:3] + [omocode])
+    right = FiscalCodeSet(SAMPLE_CODES[2:])
+    right.add(SAMPLE_CODES[2])
+
+    assert len(left) == 4 and len(right) == 3
+    assert SAMPLE_CODES[0] in left and omocode in left
+    assert SAMPLE_CODES[4] not in left and 'garbage' not in left
+    assert set(left | right) == set(SAMPLE_CODES) | {omocode}
+    assert set(left & right) == {SAMPLE_CODES[2]}
+    assert set(left - right) == {SAMPLE_CODES[0], SAMPLE_CODES[1], omocode}
+    assert left | right == right | left
+
+
+def test_codeset_rejects_invalid_codes():
+    with pytest.raises(ValueError):
+        FiscalCodeSet(['RSSMRA80A01H501A'])
+
+
+def test_codeset_failed_update_changes_nothing():
+    codes = FiscalCodeSet(['RSSMRA80A01H501U'])
+    with pytest.raises(ValueError):
+        codes.update(['RSSMRA80A01H50MM', 'BNCMRA85C71F205T', 'RSSMRA80A01H501A'])
+    assert list(codes) == ['RSSMRA80A01H501U']
+
+
+def test_codeset_update_merges_sorted_runs(monkeypatch):
+    import codeset
+
+    monkeypatch.setattr(codeset, 'SORT_RUN_SIZE', 2)
+    omocode = 'RSSMRA80A01H50MM'
+    codes = FiscalCodeSet([SAMPLE_CODES[4], SAMPLE_CODES[0]])
+    codes.update(list(reversed(SAMPLE_CODES)) + [omocode, SAMPLE_CODES[1]])
+    assert list(codes) == sorted(SAMPLE_CODES, key=pack_code) + [omocode]
+    assert len(codes) == len(SAMPLE_CODES) + 1
+
+
+def test_parallel_cache_stats_include_workers():
+    records = [('Rossi', 'Mario', '01/01/1980', 'M', 'H501')] * 40
+    FiscalCodeGenerator.enable_cache(100)
+    try:
+        results = list(FiscalCodeGenerator.generate_parallel(records, workers=2, chunk_size=10))
+        stats = FiscalCodeGenerator.cache_stats()
+    finally:
+        FiscalCodeGenerator.disable_cache()
+    assert [r.fiscal_code for r in results] == ['RSSMRA80A01H501U'] * 40
+    for component in ('surname', 'name', 'birth_date'):
+        assert stats[component].hits + stats[component].misses == 40
+        assert 1 <= stats[component].misses <= 2
+
+
+def test_parallel_matches_generate_many():
+    surnames = ['Rossi', 'Bianchi', 'Verdi', 'Neri', 'Gallo', 'Conti', 'Greco', 'Bruno']
+    records = [
+        (surname, 'Mario', f'{index % 28 + 1:02d}/{index % 12 + 1:02d}/{1960 + index}', 'MF'[index % 2], 'H501')
+        for index, surname in enumerate(surnames * 5)
+    ]
+    records[3] = ('Rossi', 'Mario', '31/02/1980', 'M', 'H501')
+    records[17] = ('', 'Mario', '01/01/1980', 'M', 'H501')
+    records[26] = ('Rossi', 'Mario', '01/01/1980', 'X', 'H501')
+    records[-1] = ('Rossi', 'Mario', '01/01/1980', 'M', '')
+    parallel = list(FiscalCodeGenerator.generate_parallel(records, workers=3, chunk_size=7))
+    assert parallel == list(FiscalCodeGenerator.generate_many(records))
+    assert len({r.fiscal_code for r in parallel if r.error is None}) == len(records) - 4
+
+
+@pytest.mark.parametrize('options, message', [
+    (['--workers', '-1'], '--workers must be 0 or more'),
+    (['--workers', '-3'], '--workers must be 0 or more'),
+    (['--workers', '2', '--chunk-size', '0'], '--chunk-size must be at least 1'),
+    (['--workers', '1', '--chunk-size', '-5'], '--chunk-size must be at least 1'),
+])
+def test_cli_rejects_negative_workers(options, message, capsys):
+    from fiscalcode import parse_args
+
+    with pytest.raises(SystemExit):
+        parse_args(['--input', 'records.csv'] + options)
+    assert message in capsys.readouterr().err
+
+
+def test_strict_municipalities():
+    assert generate(municipality='Z999').municipality_code == 'Z999'
+    records = [('Rossi', 'Mario', '01/01/1980', 'M', code) for code in ('Z999', 'h501', 'Roma')]
+    FiscalCodeGenerator.enable_strict_municipalities()
+    try:
+        with pytest.raises(ValueError, match="Unknown municipality code 'Z999'"):
+            generate(municipality='Z999')
+        assert generate(municipality='Z110').municipality_code == 'Z110'
+        results = list(FiscalCodeGenerator.generate_many(records))
+    finally:
+        FiscalCodeGenerator.disable_strict_municipalities()
+    assert results[0].field == 'municipality_code'
+    assert [r.fiscal_code for r in results[1:]] == ['RSSMRA80A01H501U'] * 2
+
+
+@pytest.mark.parametrize('fmt, expected', [
+    ('csv', 'index,fiscal_code,error\r\n0,RSSMRA80A01H501U,\r\n1,,Gender must be \'M\' or \'F\'\r\n'),
+    ('jsonl', '{"index": 0, "fiscal_code": "RSSMRA80A01H501U", "error": null}\n'
+              '{"index": 1, "fiscal_code": null, "error": "Gender must be \'M\' or \'F\'"}\n'),
+])
+def test_write_results_columns(fmt, expected):
+    records = [('Rossi', 'Mario', '01/01/1980', g, 'H501') for g in ('M', 'X')]
+    stream = io.StringIO()
+    assert write_results(FiscalCodeGenerator.generate_many(records), stream, fmt) == (2, 1)
+    assert stream.getvalue() == expected
+
+
+def test_letter_table_does_not_grow():
+    from fiscalcode import _LETTERS
+
+    size = len(_LETTERS)
+    assert FiscalCodeGenerator.get_surname_code('Ωmega 山田 Ærø') == 'MGR'
+    assert len(_LETTERS) == size
+
+
+@pytest.mark.parametrize('surname, expected', [
+    ('Nicolò', 'NCL'),
+    ("D'Angelo", 'DNG'),
+    ('ﬁlippo', 'FLP'),
+    ('Ǉubica', 'LJB'),
+    ('ǆemal', 'DZM'),
+    ('Ĳsbrand', 'JSB'),
+])
+def test_surname_code_folds_accents_and_ligatures(surname, expected):
+    assert FiscalCodeGenerator.get_surname_code(surname) == expected
+
+
+def test_jsonl_rejects_non_record_rows():
+    from fiscalcode import read_records
+
+    lines = [
+        '{"surname": "Rossi", "name": "Mario", "birth_date": "01/01/1980", "gender": "M", "municipality_code": "H501"}',
+        '["Rossi", "Mario", "01/01/1980", "M", "H501"]',
+        '"Rossi"', 'null', '42', '["Rossi", "Mario"]', '{broken',
+    ]
+    results = list(FiscalCodeGenerator.generate_many(read_records(io.StringIO('\n'.join(lines)), 'jsonl')))
+    assert [r.fiscal_code for r in results[:2]] == ['RSSMRA80A01H501U'] * 2
+    assert [r.error for r in results[2:6]] == ["Each record must be a JSON object or array"] * 4
+    assert results[6].error.startswith('Invalid JSON')
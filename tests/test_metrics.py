@@ -0,0 +1,26 @@
+from metrics import MetricsRegistry
+
+
+def samples(registry):
+    """Sample lines of a registry render, keyed by series."""
+    return dict(
+        line.rsplit(' ', 1) for line in registry.render().splitlines() if not line.startswith('#')
+    )
+
+
+def test_large_values_keep_full_precision():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests.', ('status',))
+    seconds = registry.histogram('duration_seconds', 'Durations.', buckets=(1.0,))
+    requests.inc('200', amount=1234567)
+    requests.inc('200')
+    requests.inc('500', amount=0.5)
+    seconds.observe(1200000.369)
+    seconds.observe(0.25)
+
+    lines = samples(registry)
+    assert lines['requests_total{status="200"}'] == '1234568'
+    assert lines['requests_total{status="500"}'] == '0.5'
+    assert float(lines['duration_seconds_sum']) == 1200000.369 + 0.25
+    assert lines['duration_seconds_bucket{le="1"}'] == '1'
+    assert lines['duration_seconds_count'] == '2'
@@ -0,0 +1,122 @@
+import pytest
+
+from fiscalcode import FiscalCodeGenerator
+from municipalities import Municipality, MunicipalityRegistry, get_registry
+
+
+HOMONYMS = [
+    ('A001', 'Castro', 'BG'),
+    ('A002', 'Castro', 'LE'),
+    ('A003', 'Castrovillari', 'CS'),
+    ('A004', 'Forlì', 'FC'),
+]
+
+
+@pytest.fixture
+def registry():
+    return MunicipalityRegistry(HOMONYMS)
+
+
+def test_search_folds_case_and_accents():
+    registry = get_registry()
+    assert registry.search('rom') == [
+        Municipality('H501', 'Roma', 'RM'),
+        Municipality('Z129', 'Romania', 'EE'),
+    ]
+    assert registry.search('FORLI') == registry.search('forlì') == [Municipality('D704', 'Forlì', 'FC')]
+    assert [m.code for m in registry.search('reggio ')] == ['H224', 'H223']
+
+
+def test_search_limit_and_empty_prefix(registry):
+    assert [m.code for m in registry.search('castro', 2)] == ['A001', 'A002']
+    assert registry.search('') == registry.search(" '- ") == []
+    assert registry.search('xyz') == []
+
+
+def test_find(registry):
+    assert registry.find('CASTRO') == [Municipality('A001', 'Castro', 'BG'), Municipality('A002', 'Castro', 'LE')]
+    assert registry.find('castro', 'le') == [Municipality('A002', 'Castro', 'LE')]
+    assert registry.find('Castro', 'RM') == []
+    assert registry.find('Forli') == [Municipality('A004', 'Forlì', 'FC')]
+
+
+def test_resolve(registry):
+    assert registry.resolve(' h501 ') == 'H501'
+    assert registry.resolve('forli') == 'A004'
+    assert registry.resolve('Castro (le)') == 'A002'
+    assert registry.resolve('Castro(BG)') == 'A001'
+
+
+@pytest.mark.parametrize('value, message', [
+    ('Atlantide', "Unknown municipality 'Atlantide'"),
+    ('Castro (RM)', "Unknown municipality 'Castro'"),
+    ('Castro', "Ambiguous municipality 'Castro': Castro (BG), Castro (LE)"),
+])
+def test_resolve_rejects(registry, value, message):
+    with pytest.raises(ValueError) as excinfo:
+        registry.resolve(value)
+    assert str(excinfo.value) == message
+
+
+@pytest.fixture
+def missing_registry(monkeypatch, tmp_path):
+    import municipalities
+
+    monkeypatch.setenv('FISCALCODE_MUNICIPALITIES', str(tmp_path / 'missing.csv'))
+    monkeypatch.setattr(municipalities, '_registry', None)
+
+
+def test_missing_registry_is_a_municipality_error(missing_registry):
+    records = [('Rossi', 'Mario', '01/01/1980', 'M', 'H501'), ('Rossi', 'Mario', '01/01/1980', 'M', 'Roma')]
+    plain, named = FiscalCodeGenerator.generate_many(records)
+    assert plain.fiscal_code == 'RSSMRA80A01H501U'
+    assert named.field == 'municipality_code'
+    assert named.error.startswith('Municipality registry unavailable')
+
+
+@pytest.fixture
+def client():
+    pytest.importorskip('flask')
+    from app import app
+
+    return app.test_client()
+
+
+@pytest.mark.parametrize('limit, expected', [('0', 1), ('-5', 1), ('2', 2), ('500', 50), ('many', 10)])
+def test_endpoint_clamps_limit(client, monkeypatch, limit, expected):
+    import app as app_module
+
+    many = MunicipalityRegistry((f'A{i:03d}', f'Castro {i}', 'LE') for i in range(60))
+    monkeypatch.setattr(app_module, 'get_registry', lambda: many)
+    response = client.get('/api/municipalities', query_string={'q': 'castro', 'limit': limit})
+    assert response.status_code == 200
+    assert len(response.get_json()) == expected
+
+
+def test_endpoint_results_and_cache_headers(client):
+    response = client.get('/api/municipalities', query_string={'q': 'Rom'})
+    assert response.get_json() == [
+        {'code': 'H501', 'name': 'Roma', 'province': 'RM'},
+        {'code': 'Z129', 'name': 'Romania', 'province': 'EE'},
+    ]
+    assert response.headers['Cache-Control'] == 'public, max-age=86400'
+
+
+@pytest.mark.parametrize('query', [{}, {'q': ''}, {'q': "'-. "}])
+def test_endpoint_empty_prefix(client, query):
+    response = client.get('/api/municipalities', query_string=query)
+    assert response.status_code == 200
+    assert response.get_json() == []
+
+
+def test_generate_endpoint_without_registry(client, missing_registry, monkeypatch):
+    from app import app
+
+    monkeypatch.setitem(app.config, 'RESPONSE_CACHE_SIZE', 0)
+    payload = {'surname': 'Rossi', 'name': 'Mario', 'birthDate': '01/01/1980', 'gender': 'M'}
+    response = client.post('/api/generate', json=dict(payload, municipality='H501'))
+    assert response.status_code == 200
+    assert response.get_json()['municipalityName'] is None
+    response = client.post('/api/generate', json=dict(payload, municipality='Roma'))
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith('Municipality registry unavailable')
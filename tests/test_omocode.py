@@ -0,0 +1,39 @@
+import pytest
+
+from fiscalcode import FiscalCodeGenerator
+
+
+def test_omocode_variants_are_valid_and_normalize_back():
+    code = 'RSSMRA80A01H501U'
+    variants = list(FiscalCodeGenerator.omocode_variants(code))
+    assert len(variants) == 128
+    assert len(set(variants)) == 128
+    assert variants[0] == code
+    assert 'RSSMRA80A01H50MM' in variants
+    for variant in variants:
+        assert FiscalCodeGenerator.validate(variant)
+        assert FiscalCodeGenerator.normalize_omocode(variant) == code
+    assert FiscalCodeGenerator.is_omocode(variants[1])
+    assert not FiscalCodeGenerator.is_omocode(code)
+
+
+def test_omocode_variants_from_a_variant():
+    assert list(FiscalCodeGenerator.omocode_variants('RSSMRA80A01H50MM')) == list(
+        FiscalCodeGenerator.omocode_variants('rssmra80a01h501u')
+    )
+
+
+@pytest.mark.parametrize('code, message', [
+    ('garbage', 'Fiscal code must be 16 characters'),
+    ('RSSMRA80A01H501UX', 'Fiscal code must be 16 characters'),
+    ('RSSMRA8XA01H501U', 'Invalid fiscal code format'),
+    ('RSSMRA80A01H5O1U', 'Invalid fiscal code format'),
+])
+def test_omocode_variants_reject_malformed_codes(code, message):
+    with pytest.raises(ValueError) as excinfo:
+        list(FiscalCodeGenerator.omocode_variants(code))
+    assert str(excinfo.value) == message
+
+
+def test_decode_omocodic_municipality():
+    assert FiscalCodeGenerator.decode('RSSMRA80A01H50MM').municipality_code == 'H501'
@@ -0,0 +1,38 @@
+from datetime import date, datetime
+
+import pytest
+
+from fiscalcode import parse_date
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('01/01/1980', datetime(1980, 1, 1)),
+    ('1/2/1980', datetime(1980, 2, 1)),
+    ('1980-02-29', datetime(1980, 2, 29)),
+    (date(1980, 5, 6), datetime(1980, 5, 6)),
+])
+def test_parse_date(text, expected):
+    assert parse_date(text) == expected
+
+
+@pytest.mark.parametrize('text', ['', '31/02/1980', '1980/01/01', '01-01-1980', 'yesterday', '01/13/1980', None])
+def test_parse_date_errors(text):
+    with pytest.raises(ValueError, match='Invalid date format'):
+        parse_date(text)
+
+
+@pytest.mark.parametrize('text', [
+    '15/06/1995', '29/02/2000', '29/02/1981', '29/02/1900', '31/04/1990', '01/02/0000',
+    '1/2/1980', '+1/02/1980', '01/02/198٠', '1980-02-29', ' 15/06/1995',
+])
+def test_batch_date_fast_path_matches_parse_date(text):
+    from fiscalcode import FiscalCodeGenerator
+
+    record = ('Rossi', 'Mario', text, 'M', 'H501')
+    results = list(FiscalCodeGenerator.generate_many([record, record]))
+    try:
+        expected = FiscalCodeGenerator.generate('Rossi', 'Mario', parse_date(text), 'M', 'H501')
+    except ValueError as e:
+        assert [r.error for r in results] == [str(e)] * 2
+    else:
+        assert [r.fiscal_code for r in results] == [expected] * 2
@@ -0,0 +1,91 @@
+from datetime import date, datetime
+
+import pytest
+
+from fiscalcode import FiscalCodeGenerator
+
+
+RECORDS = [
+    ('Rossi', 'Mario', '01/01/1980', 'M', 'H501'),
+    ('Bianchi', 'Maria', date(1985, 3, 31), 'F', 'F205'),
+    {'surname': 'Fo', 'name': 'Li', 'birth_date': datetime(2000, 2, 29), 'gender': 'F',
+     'municipality_code': 'Roma'},
+    ('', 'Mario', '01/01/1980', 'M', 'H501'),
+    ('Rossi', 'Mario', '31/02/1980', 'M', 'H501'),
+    ('Rossi', 'Mario', 'yesterday', 'M', 'H501'),
+    ('Rossi', 'Mario', '01/01/1980', 'X', 'H501'),
+    ('Rossi', 'Mario', '01/01/1980', None, 'H501'),
+    ('Rossi', 'Mario', '01/01/1980', 'M', 'Atlantis'),
+    ('Rossi', 'Mario', 19800101, 'M', 'H501'),
+    ('Rossi', 'Mario'),
+    ValueError("Invalid JSON on line 12"),
+    {'surname': 'Rossi'},
+]
+
+STAGES = {
+    'validation', 'parse_date', 'get_surname_code', 'get_name_code',
+    'get_birth_date_code', 'calculate_check_digit',
+}
+
+
+def test_profiled_generate_many_matches_unprofiled():
+    expected = list(FiscalCodeGenerator.generate_many(RECORDS))
+    FiscalCodeGenerator.enable_profiling()
+    try:
+        profiled = list(FiscalCodeGenerator.generate_many(RECORDS))
+    finally:
+        FiscalCodeGenerator.disable_profiling()
+    assert profiled == expected
+    assert [r.fiscal_code is not None for r in expected[:3]] == [True] * 3
+    assert all(r.error is not None for r in expected[3:])
+
+
+def test_every_stage_is_counted():
+    records = [('Rossi', 'Mario', '01/01/1980', 'M', 'H501')] * 3
+    records.append(('Bianchi', 'Maria', date(1985, 3, 31), 'F', 'F205'))
+    records.append(('Rossi', 'Mario', '01/01/1980', 'X', 'H501'))
+    profiler = FiscalCodeGenerator.enable_profiling()
+    try:
+        profiler.reset()
+        assert list(FiscalCodeGenerator.generate_many(records))[-1].error is not None
+        FiscalCodeGenerator.generate('Rossi', 'Mario', date(1980, 1, 1), 'M', 'H501')
+        stats = FiscalCodeGenerator.profile_stats()
+    finally:
+        FiscalCodeGenerator.disable_profiling()
+    assert set(stats) == STAGES
+    assert stats['parse_date'].calls == 4
+    assert stats['validation'].calls == 6
+    for stage in STAGES - {'parse_date', 'validation'}:
+        assert stats[stage].calls == 5, stage
+    assert all(stage.seconds >= 0 for stage in stats.values())
+    assert FiscalCodeGenerator.profile_stats() == {}
+
+
+def test_reset_and_summary():
+    profiler = FiscalCodeGenerator.enable_profiling()
+    try:
+        assert FiscalCodeGenerator.enable_profiling() is profiler
+        profiler.record('validation', 0.5)
+        assert profiler.stats()['validation'].calls == 1
+        assert profiler.summary().splitlines()[1].split()[:2] == ['validation', '1']
+        profiler.reset()
+        assert profiler.stats() == {}
+    finally:
+        FiscalCodeGenerator.disable_profiling()
+
+
+@pytest.mark.parametrize('stage', ['get_surname_code', 'calculate_check_digit'])
+def test_failing_stage_is_still_counted(stage, monkeypatch):
+    def boom(*args):
+        raise ValueError("boom")
+
+    profiler = FiscalCodeGenerator.enable_profiling()
+    try:
+        profiler.reset()
+        monkeypatch.setattr(FiscalCodeGenerator, stage, boom)
+        (result,) = FiscalCodeGenerator.generate_many([('Rossi', 'Mario', '01/01/1980', 'M', 'H501')])
+        stats = profiler.stats()
+    finally:
+        FiscalCodeGenerator.disable_profiling()
+    assert result.error == 'boom'
+    assert stats[stage].calls == 1
@@ -0,0 +1,63 @@
+import pytest
+
+from search import FiscalCodeIndex, SearchMatch
+
+
+CODES = [
+    'RSSMRA80A01H501U',
+    'RSSMRA80A01H50MM',   # omocodic variant of the first code
+    'not a code',
+    'BNCMRA85C71F205T',
+]
+
+
+@pytest.fixture
+def index():
+    return FiscalCodeIndex.from_codes(CODES)
+
+
+def test_rows_count_invalid_lines(index):
+    assert len(index) == 4
+    assert index.skipped == 1
+
+
+def test_masked_search(index):
+    assert index.search('RSS?RA80A01H50??') == [
+        SearchMatch(0, 'RSSMRA80A01H501U'),
+        SearchMatch(1, 'RSSMRA80A01H50MM'),
+    ]
+    assert index.search('???MRA?????F205?') == [SearchMatch(3, 'BNCMRA85C71F205T')]
+
+
+def test_full_codes_find_themselves(index):
+    assert index.search('RSSMRA80A01H50MM') == [SearchMatch(1, 'RSSMRA80A01H50MM')]
+    assert index.search('RSSMRA80A01H501U') == [SearchMatch(0, 'RSSMRA80A01H501U')]
+
+
+def test_omocodic_pattern_with_wrong_check_digit(index):
+    assert index.search('RSSMRA80A01H50MA') == []
+    assert [match.row for match in index.search('RSSMRA80A01H50M?')] == [0, 1]
+
+
+def test_masked_omocodic_code_finds_itself():
+    index = FiscalCodeIndex.from_codes(['RSSMRA80A01H50MM', 'RSSMRA80A01H5LMX', 'RSSMRA80A01H501U'])
+    assert index.search('RSSMRA80A01H50?M') == [SearchMatch(0, 'RSSMRA80A01H50MM')]
+    assert index.search('RSSMRA80A01H5??X') == [SearchMatch(1, 'RSSMRA80A01H5LMX')]
+    assert index.search('RSSMRA80A01H5???') == [
+        SearchMatch(0, 'RSSMRA80A01H50MM'),
+        SearchMatch(1, 'RSSMRA80A01H5LMX'),
+        SearchMatch(2, 'RSSMRA80A01H501U'),
+    ]
+
+
+def test_check_digit_filters_plain_patterns(index):
+    assert index.search('RSSMRA80A01H501A') == []
+
+
+def test_invalid_patterns(index):
+    with pytest.raises(ValueError):
+        index.search('RSSMRA')
+    with pytest.raises(ValueError):
+        index.search('?' * 16)
+    with pytest.raises(ValueError):
+        index.search('RS1MRA80A01H501U')
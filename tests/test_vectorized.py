@@ -0,0 +1,27 @@
+import pytest
+
+from conftest import SAMPLE_CODES
+from fiscalcode import FiscalCodeGenerator
+
+
+def test_vectorized_matches_scalar_validate():
+    np = pytest.importorskip('numpy')
+    from vectorized import validate_array
+
+    codes = list(SAMPLE_CODES)
+    codes += list(FiscalCodeGenerator.omocode_variants(SAMPLE_CODES[1]))[:20]
+    codes += [
+        'RSSMRA80A01H501A',   # check digit
+        'RSSMRA80Z01H501U',   # month
+        'RSSMRA80B30H501U',   # day
+        'RSSMRA81B29H501R',   # 29 February, not a leap year
+        'RSSMRA80B29H501' + FiscalCodeGenerator.calculate_check_digit('RSSMRA80B29H501'),
+        'RSSMRA80A01H501',    # short
+        'RSSMRA80A01H501UX',  # long
+        'rssmra80a01h501u',   # lower case
+        'RSSMRA8ÀA01H501U',   # non-ASCII
+        '',
+    ]
+    valid, _ = validate_array(codes)
+    assert valid.tolist() == [FiscalCodeGenerator.validate(code) for code in codes]
+    assert validate_array(np.array(codes, dtype='U'))[0].tolist() == valid.tolist()
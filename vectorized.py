@@ -0,0 +1,126 @@
+"""
+Italian Fiscal Code - NumPy kernels
+Vectorized check digit computation and validation for arrays of codes.
+
+Requires numpy (optional dependency; fiscalcode.py works without it).
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from fiscalcode import FiscalCodeGenerator
+
+
+CODE_LENGTH = 16
+
+# Per-byte lookup tables built from the scalar generator's tables
+_ODD_WEIGHTS = np.frombuffer(FiscalCodeGenerator.ODD_WEIGHTS, dtype=np.uint8)
+_EVEN_WEIGHTS = np.frombuffer(FiscalCodeGenerator.EVEN_WEIGHTS, dtype=np.uint8)
+_CHECK_LETTERS = np.frombuffer(FiscalCodeGenerator.CHECK_LETTERS.encode('ascii'), dtype=np.uint8)
+
+# Row i holds the weights for position i, so one fancy-indexing pass
+# weighs a whole (N, 15) block
+_POSITION_WEIGHTS = np.stack([
+    _ODD_WEIGHTS if i % 2 == 0 else _EVEN_WEIGHTS for i in range(CODE_LENGTH - 1)
+]).astype(np.uint16)
+_POSITIONS = np.arange(CODE_LENGTH - 1)
+
+_IS_LETTER = np.zeros(256, dtype=bool)
+_IS_LETTER[ord('A'):ord('Z') + 1] = True
+
+# Value of a digit position (omocodia letters included), -1 if invalid
+_DIGIT_VALUES = np.full(256, -1, dtype=np.int16)
+for _char, _value in FiscalCodeGenerator.DIGIT_VALUES.items():
+    _DIGIT_VALUES[ord(_char)] = _value
+
+# Month number for each month letter, 0 if invalid
+_MONTH_NUMBERS = np.zeros(256, dtype=np.uint8)
+for _char, _value in FiscalCodeGenerator.MONTH_NUMBERS.items():
+    _MONTH_NUMBERS[ord(_char)] = _value
+
+_DAYS_IN_MONTH = np.array([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int16)
+
+_LETTER_POSITIONS = [0, 1, 2, 3, 4, 5, 8, 11, 15]
+_DIGIT_POSITIONS = [6, 7, 9, 10, 12, 13, 14]
+
+
+def as_code_matrix(codes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert codes to an (N, 16) uint8 matrix of character codes.
+
+    Accepts an (N, 16) uint8 array, a NumPy bytes ('S') or str ('U')
+    array, or any sequence of strings. Codes of the wrong length and
+    non-ASCII characters cannot be valid and are flagged.
+
+    Returns:
+        Tuple of (matrix, length_ok mask)
+    """
+    arr = np.asarray(codes)
+    if arr.dtype == np.uint8 and arr.ndim == 2 and arr.shape[1] == CODE_LENGTH:
+        return arr, np.ones(len(arr), dtype=bool)
+
+    arr = np.ascontiguousarray(arr.reshape(-1))
+    n = len(arr)
+    if n == 0:
+        return np.zeros((0, CODE_LENGTH), dtype=np.uint8), np.zeros(0, dtype=bool)
+    if arr.dtype.kind == 'S':
+        width = arr.dtype.itemsize
+        matrix = arr.view(np.uint8).reshape(n, width)
+    elif arr.dtype.kind == 'U':
+        width = arr.dtype.itemsize // 4
+        wide = arr.view(np.uint32).reshape(n, width)
+        # Non-ASCII characters become NUL, which no position accepts
+        matrix = np.where(wide < 128, wide, 0).astype(np.uint8)
+    else:
+        raise ValueError("Codes must be a bytes/str array or an (N, 16) uint8 array")
+
+    if width < CODE_LENGTH:
+        padded = np.zeros((n, CODE_LENGTH), dtype=np.uint8)
+        padded[:, :width] = matrix
+        return padded, np.zeros(n, dtype=bool)
+
+    # Fixed-width arrays pad short values with NUL bytes
+    length_ok = matrix[:, CODE_LENGTH - 1] != 0
+    if width > CODE_LENGTH:
+        length_ok &= ~matrix[:, CODE_LENGTH:].any(axis=1)
+        matrix = matrix[:, :CODE_LENGTH]
+    return matrix, length_ok
+
+
+def check_digits(matrix: np.ndarray) -> np.ndarray:
+    """Compute the check character (as a uint8) for each row's first 15 characters."""
+    totals = _POSITION_WEIGHTS[_POSITIONS, matrix[:, :CODE_LENGTH - 1]].sum(axis=1)
+    return _CHECK_LETTERS[totals % 26]
+
+
+def validate_array(codes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Validate many fiscal codes at once.
+
+    Applies the same checks as FiscalCodeGenerator.validate (structure,
+    month letter, day range, check digit) to every code.
+
+    Args:
+        codes: Codes as accepted by as_code_matrix
+
+    Returns:
+        Tuple of (boolean validity mask, computed check characters as an
+        'S1' array)
+    """
+    matrix, valid = as_code_matrix(codes)
+
+    valid &= _IS_LETTER[matrix[:, _LETTER_POSITIONS]].all(axis=1)
+    digits = _DIGIT_VALUES[matrix[:, _DIGIT_POSITIONS]]
+    valid &= (digits >= 0).all(axis=1)
+
+    month = _MONTH_NUMBERS[matrix[:, 8]]
+    day = _DIGIT_VALUES[matrix[:, 9]] * 10 + _DIGIT_VALUES[matrix[:, 10]]
+    day = np.where(day > 40, day - 40, day)
+    valid &= (month > 0) & (day >= 1) & (day <= _DAYS_IN_MONTH[month])
+    year = _DIGIT_VALUES[matrix[:, 6]] * 10 + _DIGIT_VALUES[matrix[:, 7]]
+    valid &= ~((month == 2) & (day == 29) & (year % 4 != 0))
+
+    computed = check_digits(matrix)
+    valid &= computed == matrix[:, CODE_LENGTH - 1]
+    return valid, computed.view('S1')